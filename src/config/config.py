@@ -1,7 +1,9 @@
 import json
 import csv
+import os
 import sys
 import logging
+import threading
 from pathlib import Path
 
 COLORS = {
@@ -16,6 +18,141 @@ if not sys.stdout.isatty():
     COLORS = {key: "" for key in COLORS}
 
 
+class BooksIndex:
+    """
+    Read-only ISBN lookup over books.csv.
+    Only the byte offset of each record is kept in memory; a record is parsed when it is looked up,
+    through one handle kept open for the purpose. The index is rebuilt if the file changes.
+    Lookups made while the index is being built wait for it; the UI thread checks ready() first
+    and retries later rather than block.
+    """
+
+    RETRY_MS = 100  # how soon the UI looks again while ready() is False
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.fieldnames = []
+        self._offsets = {}
+        self._stamp = None  # (mtime_ns, size) of the file the offsets were taken from
+        self._file = None
+        self._lock = threading.Lock()  # guards the shared handle's position
+        self._loaded = threading.Event()
+        self._building = False
+
+    @property
+    def loaded(self):
+        return self._loaded.is_set()
+
+    def ready(self):
+        """True when a lookup would not block. A changed file starts re-indexing in the background."""
+        if self._loaded.is_set() and self._is_stale():
+            logging.info(f"{self.path} changed; re-indexing.")
+            self.build_in_background()
+        return self._loaded.is_set()
+
+    def build_in_background(self):
+        """Starts (re)indexing on a daemon thread; lookups wait for it and ready() is False meanwhile."""
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+            self._loaded.clear()
+        threading.Thread(target=self._build_logged, name="BooksIndex", daemon=True).start()
+
+    def _build_logged(self):
+        try:
+            self.build()
+            logging.info(f"Indexed {len(self._offsets)} books from {self.path.name}.")
+        except FileNotFoundError:
+            logging.error(f"Error: {self.path} not found.")
+        except Exception as e:
+            logging.error(f"Error reading {self.path}: {e}")  # Index stays empty
+        finally:
+            with self._lock:
+                self._building = False
+
+    def build(self):
+        """Scans the file once, recording the byte offset of each record keyed by its ISBN column."""
+        try:
+            csvfile = self.path.open("rb")
+            try:
+                st = os.fstat(csvfile.fileno())
+                end = 0
+
+                def lines():
+                    nonlocal end
+                    for line in csvfile:
+                        end += len(line)  # csv.reader pulls no further than the record it returns
+                        yield line.decode("utf-8")
+
+                # records, not lines: a quoted field may hold newlines
+                reader = csv.reader(lines())
+                fieldnames = next(reader, [])
+                if fieldnames:
+                    fieldnames[0] = fieldnames[0].lstrip("\ufeff")
+                isbn_col = fieldnames.index("ISBN")
+                offsets = {}
+                start = end
+                for fields in reader:
+                    if len(fields) > isbn_col and fields[isbn_col]:
+                        offsets[fields[isbn_col]] = start  # later rows win, as with a dict build
+                    start = end
+            except BaseException:
+                csvfile.close()
+                raise
+            with self._lock:
+                previous = self._file
+                self._file = csvfile
+                self.fieldnames = fieldnames
+                self._offsets = offsets
+                self._stamp = (st.st_mtime_ns, st.st_size)
+            if previous is not None:
+                previous.close()
+        finally:
+            self._loaded.set()  # a failed build leaves an empty index rather than blocking lookups
+
+    def _is_stale(self):
+        if self._stamp is None:
+            return False
+        try:
+            st = self.path.stat()
+        except OSError:
+            return False  # keep serving the last index read
+        return (st.st_mtime_ns, st.st_size) != self._stamp
+
+    def _wait(self):
+        self.ready()
+        self._loaded.wait()  # a build always sets it, even when it fails
+
+    def get(self, isbn, default=None):
+        """
+        Returns the row for isbn as a dict keyed by column name, or default if not indexed.
+        Blocks while the index is being built, so a miss is never reported early.
+        """
+        self._wait()
+        with self._lock:
+            offset = self._offsets.get(isbn)
+            if offset is None:
+                return default
+            self._file.seek(offset)
+            fields = next(csv.reader(line.decode("utf-8") for line in self._file), [])
+        return dict(zip(self.fieldnames, fields))
+
+    def __getitem__(self, isbn):
+        row = self.get(isbn)
+        if row is None:
+            raise KeyError(isbn)
+        return row
+
+    def __contains__(self, isbn):
+        self._wait()
+        return isbn in self._offsets
+
+    def __len__(self):
+        self._wait()
+        return len(self._offsets)
+
+
 class Config:
     """Handles shared Master processing configuration (Read-Only)."""
 
@@ -70,18 +207,7 @@ class Config:
             return self.default_config
 
     def _load_books_csv(self):
-        """Loads books.csv into memory as a dictionary for quick lookup."""
-        books = {}
-        try:
-            with self.books_csv_path.open("r", encoding="utf-8") as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    isbn = row.get("ISBN")
-                    if isbn:
-                        books[isbn] = row  # Store row with ISBN as key
-            logging.info("Loaded books.csv into memory.")
-        except FileNotFoundError:
-            logging.error(f"Error: {self.books_csv_path} not found.")
-        except Exception as e:
-            logging.error(f"Error reading {self.books_csv_path}: {e}")
-        return books  # Return empty dict if file is missing
\ No newline at end of file
+        """Starts indexing books.csv by ISBN in the background so the UI can paint first."""
+        books = BooksIndex(self.books_csv_path)
+        books.build_in_background()
+        return books
@@ -5,8 +5,7 @@ import ffmpeg
 import hashlib
 import shutil
 import re
-from natsort import natsorted
-from utils import remove_folder, compute_sha256, get_first_audiofile, get_metadata_from_audio, generate_sku, generate_isbn, parse_time_to_minutes
+from utils import remove_folder, compute_sha256, iter_files, get_first_audiofile, get_metadata_from_audio, generate_sku, generate_isbn, parse_time_to_minutes
 from .tracks import Tracks
 from .diskimage import DiskImage
 from utils import MasterValidator
@@ -165,7 +164,8 @@ class Master:
             return None
 
         try:
-            all_files = natsorted([p for p in root.rglob("*") if p.is_file()])
+            # compute_sha256 puts the files in natural order itself
+            all_files = list(iter_files(root))
             self._checksum = compute_sha256(all_files)
             self.logger.info(f"Computing checksum for files {all_files}")
             self.logger.info(f"Computed checksum: {self._checksum}")
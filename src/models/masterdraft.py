@@ -1,4 +1,5 @@
 from pathlib import Path
+import os
 import pycdlib
 import logging
 import ffmpeg
@@ -121,16 +122,20 @@ class MasterDraft:
 
 
         # Check for presence of audio files in supported formats
-        if not input_path or not input_path.exists():
+        input_exists = bool(input_path) and input_path.exists()
+        if not input_exists:
             errors.append(f"Input folder does not exist: {input_path}")
         else:
-            audio_files = [f for f in input_path.iterdir() if f.suffix.lower() in self.config.params.get("valid_formats",None)]
+            # One directory read; only the names are needed, so no Path per entry
+            valid_formats = self.config.params.get("valid_formats",None)
+            with os.scandir(input_path) as entries:
+                audio_files = [e.name for e in entries if os.path.splitext(e.name)[1].lower() in valid_formats]
             if not audio_files:
                 errors.append(f"No valid audio files found in input folder: {input_path}")
 
         # Compare file count if expected is specified
         if getattr(self, "file_count_expected", None) is not None and getattr(self, "file_count_expected", None) > 0:
-            actual = len(audio_files) if input_path and input_path.exists() else 0
+            actual = len(audio_files) if input_exists else 0
             if actual != self.file_count_expected:
                 errors.append(f"Expected {self.file_count_expected} files, found {actual}")
 
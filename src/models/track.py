@@ -43,7 +43,10 @@ class Track:
 
         self.output_file = f"{str(self.index).zfill(3)}_{slugify(str(self.isbn)[-5:])}{slugify(str(self.sku)[-4:]).upper()}"[:13] + ".mp3"
 
-        self.track_analysis = analyze_track(self.file_path, self.params, self.tests)
+        # Tracks may pass in an analysis already run in a batch; otherwise analyze here
+        self.track_analysis = kwargs.get("track_analysis")
+        if self.track_analysis is None:
+            self.track_analysis = analyze_track(self.file_path, self.params, self.tests)
         metadata = self.track_analysis.get("metadata", {})
         loudness = self.track_analysis.get("loudness", {})
         
@@ -66,7 +69,8 @@ class Track:
         # else:
         #     self.apply_tests()  # Perform all ffmpeg-related analysis first
 
-        logging.debug(f"File index {file_index}, is called {file_path.parent.name}/{file_path.name} of type {self.file_type} metadata: {self.metadata} analysis:{self.track_analysis}")
+        logging.debug("File index %s, is called %s/%s of type %s metadata: %s analysis:%s",
+                      file_index, file_path.parent.name, file_path.name, self.file_type, self.metadata, self.track_analysis)
 
     def __str__(self):
         
@@ -3,13 +3,14 @@ import mutagen
 import ffmpeg
 from slugify import slugify
 import shutil
+import os
 from pathlib import Path
 from mutagen.mp3 import MP3
 from mutagen.id3 import ID3, TIT2, TPE1, TXXX
 from .track import Track
+from utils.audio_helper import analyze_tracks
 import logging
 from natsort import natsorted
-from itertools import chain
 import traceback
 
 class Tracks:
@@ -39,21 +40,27 @@ class Tracks:
         # Get valid extensions from config (e.g., ['.mp3', '.wav'])
         valid_extensions = self.master.settings.get("valid_extensions", ['.mp3', '.wav'])
 
-        # Use multiple glob calls and merge results
-        files = list(chain.from_iterable(self.directory.glob(f"*{ext}") for ext in valid_extensions))
+        # One directory read matching every extension (same as a "*<ext>" glob per extension)
+        suffixes = tuple(valid_extensions)
+        with os.scandir(self.directory) as entries:
+            files = [Path(e.path) for e in entries if e.name.endswith(suffixes)]
         files = natsorted(files, key=lambda f: f.name)  # Sort naturally
 
         self.files = []
 
         logging.debug(f"Loading {len(files)} Tracks from {self.directory.parent.name}/{self.directory.name}")
 
-        for index, file in enumerate(files, start=1):
+        # Analyses are independent per file, so run them in parallel up front
+        analyses = analyze_tracks(files, self.audio_params, self.tests)
+
+        for index, (file, analysis) in enumerate(zip(files, analyses), start=1):
             try:
                 track = Track(file, index, self.audio_params, self.tests, **{
                     "title": self.master.title,
                     "author": self.master.author,
                     "isbn": self.master.isbn,
-                    "sku": self.master.sku
+                    "sku": self.master.sku,
+                    "track_analysis": analysis
                 })
                 logging.debug(f"........Loaded {file.name}")
                 self.files.append(track)
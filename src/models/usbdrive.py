@@ -9,7 +9,6 @@ import pathlib
 import hashlib, shlex, json
 from dataclasses import dataclass
 from typing import Optional, Tuple
-from natsort import natsorted
 from utils import compute_sha256
 from pathlib import Path
 from utils import MasterValidator
@@ -61,6 +60,7 @@ class USBDrive:
         self.mountpath = Path(mountpoint) #eg /Volumes/AA11111AA
         self.mountpoint = mountpoint.rstrip("/")
         self._info: Optional[DriveInfo] = None  # cache
+        self._refresh_lock = threading.RLock()  # one refresh (and validate) at a time per drive
 
         self.device_path = device_path or self.get_device_path()  # eg "/dev/disk4"
         # self.capacity = self.get_capacity()
@@ -241,7 +241,9 @@ class USBDrive:
     def info(self) -> DriveInfo:
         """Cached DriveInfo; call refresh_info() to update."""
         if self._info is None:
-            return self.refresh_info()
+            with self._refresh_lock:
+                if self._info is None:  # unless a refresh on another thread just finished
+                    return self.refresh_info()
         return self._info
 
     @property
@@ -251,6 +253,10 @@ class USBDrive:
         return round(u.total / (1024 ** 3), 2) if u else None
 
     def refresh_info(self) -> DriveInfo:
+        with self._refresh_lock:
+            return self._refresh_info()
+
+    def _refresh_info(self) -> DriveInfo:
         mp = self.mountpoint
         logging.debug("Refreshing DriveInfo for %s", mp)
 
@@ -350,18 +356,23 @@ class USBDrive:
         EXCLUDED_FILES = {"checksum.txt", ".DS_Store", "Thumbs.db"}
         EXCLUDED_DIRS = {".Spotlight-V100", ".Trashes", ".fseventsd", ".TemporaryItems"}
 
-        # Get all valid files recursively, excluding system files and directories
-        file_paths = natsorted(
-            [
-                file for file in self.mountpoint.rglob("*") 
-                if file.is_file() 
-                and file.name not in EXCLUDED_FILES  # Exclude specific files
-                and not any(excluded in file.parts for excluded in EXCLUDED_DIRS)  # Exclude hidden/system directories
-            ]
-        )
+        # Get all valid files recursively, excluding system files and directories. One os.scandir
+        # walk: DirEntry carries the file type from the listing, so entries aren't stat'ed again,
+        # and excluded directories are never entered. compute_sha256 does the natural ordering.
+        def iter_files(path):
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDED_DIRS:  # Exclude hidden/system directories
+                            yield from iter_files(entry.path)
+                    elif entry.name not in EXCLUDED_FILES and entry.is_file():  # Exclude specific files
+                        yield Path(entry.path)
+
+        file_paths = list(iter_files(self.mountpoint))
         
         try:
-            checksum_value = compute_sha256(file_paths)
+            # the drive's files aren't read again after this: don't keep them in the page cache
+            checksum_value = compute_sha256(file_paths, drop_cache=True)
             logging.info(f"Computed drive checksum: {checksum_value}")
             return checksum_value
         except Exception as e:
@@ -372,13 +383,13 @@ class USBDrive:
         """Loads the expected checksum from /bookinfo/checksum.txt if available."""
         checksum_path = self.mountpoint / "bookInfo" / "checksum.txt"
 
-        if not checksum_path.is_file():
+        # Just open it: a missing file (or a directory in its place) shows up as the error,
+        # without a separate is_file() stat first
+        try:
+            return checksum_path.read_text(encoding="utf-8").strip()
+        except (FileNotFoundError, IsADirectoryError):
             logging.warning("No checksum.txt found in bookinfo directory.")
             return None
-
-        try:
-            with checksum_path.open("r", encoding="utf-8") as f:
-                return f.read().strip()
         except Exception as e:
             logging.error(f"Failed to read 'checksum.txt': {e}")
             return None
@@ -537,17 +548,21 @@ class USBDrive:
 
             # self.current_content["tracks_check"] = check_mp3_folder(tracks_path)
 
+            # One listing of the drive root answers both: is the metafile present, and are
+            # any other hidden (system) files there
+            with os.scandir(self.mountpoint) as entries:
+                hidden = {entry.name for entry in entries if entry.name.startswith('.')}
+
             # metafile present
-            self.current_content["metadata_file"] =  metadata_file.exists()
+            self.current_content["metadata_file"] = metadata_file.name in hidden
 
             # remove_system_files(self.mountpoint)
-            metadata_file.touch()
-            
-            # hidden files present
-            self.current_content["system_files"] = any(
-                item.name.startswith('.') 
-                for item in Path(self.mountpoint).iterdir()
-            )
+            if not self.current_content["metadata_file"]:
+                metadata_file.touch()
+
+            # hidden files present; the metafile itself is wanted, not a system file
+            hidden.discard(metadata_file.name)
+            self.current_content["system_files"] = bool(hidden)
 
             # TEMP: dont do this as slow while testing
             # self.checksum = self.compute_checksum()  # Compute actual checksum
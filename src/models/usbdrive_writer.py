@@ -2,6 +2,9 @@
 import subprocess, threading, queue, os, re, logging, time
 from utils.sudo_askpass import make_askpass_script
 
+# pv -n ends each percentage with a newline (or carriage return)
+_PV_LINE_SPLIT = re.compile(rb"[\r\n]")
+
 class ImageWriteTask:
     def __init__(self, parent_widget, image_path:str, raw_whole:str, log_cb=None, progress_cb=None, done_cb=None, use_sudo=True):
         self.parent = parent_widget
@@ -64,17 +67,20 @@ class ImageWriteTask:
 
             # Read pv numeric progress on a side thread
             def read_pv_stderr():
+                # one os.read takes whatever pv has written so far, rather than a read per byte
+                fd = self._pv.stderr.fileno()
                 percent_buf = b""
-                for chunk in iter(lambda: self._pv.stderr.read(1), b""):
+                while True:
+                    chunk = os.read(fd, 4096)
+                    if not chunk: return
                     if self._stop: return
-                    if chunk in (b"\n", b"\r"):
-                        s = percent_buf.decode("utf-8", "ignore").strip()
-                        percent_buf = b""
+                    # complete lines go out; a trailing partial one waits for the next read
+                    *lines, percent_buf = _PV_LINE_SPLIT.split(percent_buf + chunk)
+                    for line in lines:
+                        s = line.decode("utf-8", "ignore").strip()
                         if s.isdigit():
                             pct = min(100, max(0, int(s)))
                             self.parent.after(0, self.progress_cb, pct)
-                    else:
-                        percent_buf += chunk
 
             t = threading.Thread(target=read_pv_stderr, daemon=True)
             t.start()
@@ -7,6 +7,7 @@ import platform
 import hashlib
 import logging
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Callable, Optional
 from models import USBDrive
 
@@ -32,6 +33,8 @@ class USBHub:
 
         self.lock = threading.Lock()
         self._stop = threading.Event()
+        # validation of newly plugged drives runs here, off the monitor thread
+        self._refresh_pool = ThreadPoolExecutor(thread_name_prefix="USBHubRefresh")
 
         self.monitor_thread = threading.Thread(target=self._monitor_loop, name="USBHubMonitor", daemon=True)
         self.monitor_thread.start()
@@ -41,9 +44,10 @@ class USBHub:
     # ----- lifecycle ---------------------------------------------------------
 
     def stop(self, timeout: Optional[float] = 5.0):
-        """Stop the background monitoring thread."""
+        """Stop the background monitoring thread and drop any refreshes not yet started."""
         self._stop.set()
         self.monitor_thread.join(timeout=timeout)
+        self._refresh_pool.shutdown(wait=False, cancel_futures=True)
 
     # ----- properties --------------------------------------------------------
 
@@ -110,6 +114,28 @@ class USBHub:
             except Exception:
                 logging.exception("USBHub: callback raised an exception")
 
+        # Validate newly plugged drives in the background, so neither the UI nor the next poll
+        # (removal detection) waits on it
+        self.refresh_drives([drv for drv in added.values() if drv.ui_context is not None])
+
+    def refresh_drives(self, drives: List[USBDrive]) -> List[Future]:
+        """
+        Load DriveInfo (including content validation) for several drives at once on the hub's
+        refresh threads, without waiting. Each drive is separate hardware and the work is disk I/O,
+        subprocesses and hashing that release the GIL, so a bank of drives takes about as long as
+        the slowest one. A drive the UI has already loaded is not validated again.
+        """
+        def refresh(drv):
+            try:
+                drv.info  # loads under the drive's own lock, so it never races a UI read
+            except Exception:
+                logging.exception("USBHub: failed to refresh %s", drv.mountpoint)
+
+        try:
+            return [self._refresh_pool.submit(refresh, drv) for drv in drives]
+        except RuntimeError:
+            return []  # hub stopped
+
     # ----- discovery ---------------------------------------------------------
 
     def get_usb_drives(self) -> Dict[str, USBDrive]:
@@ -7,7 +7,7 @@ import logging
 from pathlib import Path
 from utils.webcam import Webcam
 from models import Master
-from utils import find_input_folder_from_isbn, parse_time_to_minutes
+from utils import find_input_folder_from_isbn, is_isbn13, parse_time_to_minutes
 from utils.custom_logging import setup_logging
 from ui.masterdraftuiwrapper import MasterDraftUIWrapper
 from models import MasterDraft  # Import Master class
@@ -20,6 +20,7 @@ class VoxblockUI:
         self.config = config
         self.settings = settings
         self.webcam = None
+        self._isbn_retry = None  # pending after() id while books.csv is still indexing
         self.usb_hub = usb_hub
         self.usb_hub.callback = self.update_usb_list
         self.settings = settings
@@ -335,7 +336,10 @@ class VoxblockUI:
             return input_folder
 
     def _image_path_from_isbn(self, isbn: str) -> Path:
-        # self.config.books is a dict keyed by ISBN, loaded from config/books.csv
+        # self.config.books is a BooksIndex over config/books.csv; get() would block this (Tk)
+        # thread while it indexes, so report that instead and let the caller try again
+        if not self.config.books.ready():
+            raise RuntimeError("books.csv is still being indexed; try again in a moment")
         row = self.config.books.get(str(isbn))
         if not row:
             raise FileNotFoundError(f"ISBN {isbn} not found in books.csv")
@@ -428,7 +432,7 @@ class VoxblockUI:
 
     def update_isbn(self, barcode_data):
         """Callback function to update the ISBN entry"""
-        if len(barcode_data) == 13 and barcode_data.isdigit():
+        if is_isbn13(barcode_data):
             self.draft_vars["isbn"].set(barcode_data)
 
     def browse_folder(self, field):
@@ -483,26 +487,34 @@ class VoxblockUI:
         save_settings(self.settings)  
         self.root.destroy()
 
+    def _retry_isbn_lookup(self):
+        self._isbn_retry = None
+        self._on_isbn_change()
+
     # Inline lookup function
     def _on_isbn_change(self, *args):
-
+        """Triggered when ISBN changes. Looks up book details if ISBN is 13 digits."""
         if not self.lookup_csv_var.get():
             logging.debug(f"csv lookup disabled")
             return
 
         new_isbn = self.draft_vars["isbn"].get()
-        
-        """Triggered when ISBN changes. Looks up book details if ISBN is 13 digits."""
-        if not isinstance(new_isbn, str) or len(new_isbn) != 13 or not new_isbn.isdigit():
+        if not is_isbn13(new_isbn):
             logging.debug(f"Invalid ISBN '{new_isbn}': must be 13 digits.")
             self.draft.reset()
             return
 
+        if not self.config.books.ready():
+            # still indexing: look again shortly rather than block Tk or report a miss
+            if self._isbn_retry is None:
+                self._isbn_retry = self.root.after(self.config.books.RETRY_MS, self._retry_isbn_lookup)
+            return
+
         logging.info(f"Looking up data for {new_isbn}")
 
-        row = self.config.books.get(new_isbn, {})  # Fast lookup from cached dictionary
+        row = self.config.books.get(new_isbn)  # Fast lookup from books index
 
-        if not row:
+        if row is None:
             logging.warning(f"No data found for {new_isbn}")
             self.draft_vars["sku"].set("")
             self.draft_vars["title"].set("")
@@ -1,26 +1,50 @@
 import tkinter as tk
 import logging
-import csv
-from tkinter import messagebox, filedialog
-from tkinter.scrolledtext import ScrolledText
-from utils.custom_logging import setup_logging, TextHandler
+import threading
+import functools
+from tkinter import filedialog
 from models import MasterDraft  # Import Master class
-from utils import find_input_folder_from_isbn, parse_time_to_minutes
-from utils import remove_folder, compute_sha256, get_first_audiofile, get_metadata_from_audio, generate_sku, generate_isbn
-from utils import MasterValidator
+from utils import is_isbn13, parse_time_to_minutes
+
+
+def _make_var(value):
+    """Creates the Tkinter variable matching the type of value (None maps to an empty StringVar)."""
+    t = type(value)
+    if t is str:
+        return tk.StringVar(value=value)
+    if value is None:
+        return tk.StringVar(value="")
+    if t is int:
+        return tk.IntVar(value=value)
+    if t is bool:
+        return tk.BooleanVar(value=value)
+    if t is float:
+        return tk.DoubleVar(value=value)
+    if t is list:
+        return tk.StringVar(value=",".join(value))
+    raise TypeError(f"Unsupported field type {t.__name__} for Tkinter variable")
+
+
+class _VarField:
+    """Descriptor exposing a wrapper's Tkinter variable as a plain attribute."""
+
+    def __init__(self, key):
+        self.key = key
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._vars[self.key].get()
+
+    def __set__(self, obj, value):
+        obj._vars[self.key].set(value)
+
+
 class MasterDraftUIWrapper:
     """
     Wrapper class for managing Tkinter UI state while keeping Master logic separate.
     """
 
-    VARIABLE_TYPES = {
-        str: lambda value="": tk.StringVar(value=value),
-        int: lambda value=0: tk.IntVar(value=value),
-        bool: lambda value=False: tk.BooleanVar(value=value),
-        float: lambda value=0.0: tk.DoubleVar(value=value),
-        list: lambda value=[]: tk.StringVar(value=",".join(value)),
-    }
-
     def __init__(self, main_window, config, settings):
         self.main_window = main_window
         self.root = main_window.root
@@ -42,68 +66,87 @@ class MasterDraftUIWrapper:
 
         self.settings = settings
         
-        print (self.get_fields().items())
+        logging.debug(f"Draft UI fields: {self.get_fields()}")
         # Create Tkinter variables dynamically
-        self._vars = {
-            key: self.VARIABLE_TYPES[type(value) if value is not None else str](value if value is not None else "")
-            for key, value in self.get_fields().items()
-        }
+        self._vars = {key: _make_var(value) for key, value in self.get_fields().items()}
 
+        # Keys written in the UI since the last push to the draft
+        self._dirty = set()
 
-        # Attach trace_add to each variable to sync with Master instance
+        # Thread loading the selected input folder into the draft; one at a time
+        self._folder_worker = None
+
+
+        # Attach trace_add to each variable to sync with Master instance.
+        # Traces are registered once; swapping the draft only sets values, it never re-binds.
         for key, var in self._vars.items():
-            var.trace_add("write", self._on_var_change(key))
+            var.trace_add("write", functools.partial(self._on_var_change, key))
 
 
-        # Dynamically create properties that sync with Tkinter variables
+        # Dynamically create descriptors that sync with Tkinter variables
         for key in self._vars:
-            setattr(self.__class__, key, property(
-                lambda self, k=key: self._vars[k].get(),
-                lambda self, value, k=key: self._vars[k].set(value)
-            ))
+            setattr(self.__class__, key, _VarField(key))
 
         self._callbacks = {
             "isbn": self._on_isbn_change
         }
 
+        # Cache lookup state so ISBN keystrokes skip the Tcl round-trip and attribute hops
+        self._books = self.config.books
+        self._isbn_retry = None  # pending after() id while books.csv is still indexing
+        self._lookup_enabled = main_window.lookup_csv_var.get()
+        main_window.lookup_csv_var.trace_add("write", self._on_lookup_csv_change)
+
 
     def loadMasterDraft(self):
         
         self.draft = MasterDraft(self.config, self.settings, self.isbn, self.sku, self.author, self.title, self.expected_count, self.input_folder)
 
-    def _on_var_change(self, key):
-        """Creates a callback function for trace_add to sync UI changes with Master."""
-        def callback(*args):
-            new_value = self._vars[key].get()
-            if getattr(self, key, None) != new_value:  # Prevent infinite loops
-                logging.debug(f"Syncing UI change: {key} -> {new_value}")
-                setattr(self, key, new_value)
+    def _on_var_change(self, key, *args):
+        """trace_add callback (bound per key with functools.partial) syncing UI changes with Master."""
+        self._dirty.add(key)
+        new_value = self._vars[key].get()
+        if getattr(self, key, None) != new_value:  # Prevent infinite loops
+            logging.debug(f"Syncing UI change: {key} -> {new_value}")
+            setattr(self, key, new_value)
 
-            # Trigger additional callbacks if needed
-            if key in self._callbacks:
-                self._callbacks[key](new_value)
+        # Trigger additional callbacks if needed
+        callback = self._callbacks.get(key)
+        if callback:
+            callback(new_value)
 
-        return callback
 
+    def _on_lookup_csv_change(self, *_):
+        """Keeps the cached CSV lookup flag in step with the main window checkbox."""
+        self._lookup_enabled = self.main_window.lookup_csv_var.get()
+
+    def _retry_isbn_lookup(self):
+        self._isbn_retry = None
+        self._on_isbn_change()
 
     # Inline lookup function
     def _on_isbn_change(self, *args):
-        if not self.main_window.lookup_csv_var.get():
+        """Triggered when ISBN changes. Looks up book details if ISBN is 13 digits."""
+        if not self._lookup_enabled:
             logging.debug(f"csv lookup disabled")
             return
 
         new_isbn = self._vars["isbn"].get()
-        
-        """Triggered when ISBN changes. Looks up book details if ISBN is 13 digits."""
-        if not isinstance(new_isbn, str) or len(new_isbn) != 13 or not new_isbn.isdigit():
+        if not is_isbn13(new_isbn):
             logging.debug(f"Invalid ISBN '{new_isbn}': must be 13 digits.")
             return
 
+        if not self._books.ready():
+            # still indexing: look again shortly rather than block Tk or report a miss
+            if self._isbn_retry is None:
+                self._isbn_retry = self.root.after(self._books.RETRY_MS, self._retry_isbn_lookup)
+            return
+
         logging.info(f"Looking up data for {new_isbn}")
 
-        row = self.main_window.config.books.get(new_isbn, {})  # Fast lookup from cached dictionary
+        row = self._books.get(new_isbn)  # Fast lookup from cached index
 
-        if not row:
+        if row is None:
             logging.warning(f"No data found for {new_isbn}")
             self._vars["sku"].set("")
             self._vars["title"].set("")
@@ -125,20 +168,24 @@ class MasterDraftUIWrapper:
 
     def update_ui_from_master(self):
         """Ensures UI reflects the current state of Master."""
-        for key in self._vars:
+        for key, var in self._vars.items():
             master_value = getattr(self.draft, key, None)
-            ui_value = self._vars[key].get()
-            
 
-            if master_value != ui_value:  # Prevent redundant updates
+            # set() fires traces even when unchanged, so only write real differences
+            if var.get() != master_value:
                 logging.debug(f"Syncing Master change to UI: {key} -> {master_value}")
-                self._vars[key].set(master_value)
+                var.set(master_value)
+                self._dirty.discard(key)
 
 
     def update_master_from_ui(self):
-        """Syncs Master instance properties with Tkinter variables."""
-        for key in self._vars:
+        """Syncs Master instance properties with the Tkinter variables changed since the last sync."""
+        if self._folder_busy():
+            logging.debug("Input folder still loading; UI changes will sync afterwards")
+            return  # the changed keys stay dirty
+        for key in self._dirty:
             setattr(self.draft, key, self._vars[key].get())
+        self._dirty.clear()
 
     def _on_usb_tests_change(self, *_):
         """Updates Master when the UI checkboxes change."""
@@ -146,15 +193,32 @@ class MasterDraftUIWrapper:
         self.draft.logger.info(f"Updated USB drive tests: {self.draft.usb_drive_tests}")
 
 
-    def select_input_folderOLD(self):
+    def _folder_busy(self):
+        return self._folder_worker is not None and self._folder_worker.is_alive()
+
+    def select_input_folder(self):
         """Opens a folder selection dialog, updates the corresponding Tkinter variable, and creates a Master from the input folder."""
-        folder_selected = filedialog.askdirectory()
+        if self._folder_busy():
+            logging.warning("Still loading the previous input folder; try again when it has finished.")
+            return
+        folder_selected = filedialog.askdirectory()  # dialog must stay on the Tk main thread
         if folder_selected:
             setattr(self.draft, "input_folder", folder_selected)
-            self.draft.load_input_tracks(folder_selected)  # Load tracks from the folder
+            self._folder_worker = threading.Thread(target=self._process_folder_worker, args=(folder_selected,),
+                                                   name="InputFolder", daemon=True)
+            self._folder_worker.start()
+
+    def _process_folder_worker(self, folder):
+        """Loads and checks the selected folder off the Tk thread, then refreshes the UI on it."""
+        try:
+            self.draft.load_input_tracks(folder)  # Load tracks from the folder
             self.draft.process_tracks()
             self.draft.validate_master()
-            # self.update_ui_from_master()
+        except Exception as e:
+            logging.error(f"Failed to process input folder {folder}: {e}")
+            return
+        self.root.after(0, self.update_ui_from_master)
+
     def get_fields(self):
         """Returns a dictionary of all property values for UI synchronization."""
         return {
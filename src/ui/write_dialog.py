@@ -4,6 +4,8 @@ from pathlib import Path
 from tkinter import ttk, messagebox
 
 class WriteDialog(tk.Toplevel):
+    REFRESH_MS = 100  # progress bar redraw interval, independent of the writer's tick rate
+
     def __init__(self, parent, usb_drive, image_path):
         super().__init__(parent)
         self.title("Writing image…")
@@ -22,15 +24,17 @@ class WriteDialog(tk.Toplevel):
         self.cancel_btn = ttk.Button(self.btn_frame, text="Cancel", command=self._cancel)
         self.cancel_btn.pack(side="right")
 
+        # Progress callbacks only record the value; the bar is redrawn on a timer.
+        # Neither callback touches a Tk widget directly, so both are safe from the writer thread.
+        self._latest_pct = 0
+        self._shown_pct = 0
+        self._tick = self.after(self.REFRESH_MS, self._refresh)
+
         def on_progress(pct):
-            self.var.set(pct)
+            self._latest_pct = pct
 
         def on_done(ok, err):
-            if ok:
-                messagebox.showinfo("Done", "Disk image written successfully.")
-            else:
-                messagebox.showerror("Error", err or "Write failed.")
-            self.destroy()
+            self.after(0, self._finish, ok, err)
 
         # Start async task
         self.task = usb_drive.write_disk_image_async(
@@ -41,7 +45,28 @@ class WriteDialog(tk.Toplevel):
             use_sudo=True,
         )
 
+    def _refresh(self):
+        if self._latest_pct != self._shown_pct:
+            self._shown_pct = self._latest_pct
+            self.var.set(self._shown_pct)
+        self._tick = self.after(self.REFRESH_MS, self._refresh)
+
+    def _finish(self, ok, err):
+        self._stop_refresh()
+        self.var.set(self._latest_pct)
+        if ok:
+            messagebox.showinfo("Done", "Disk image written successfully.")
+        else:
+            messagebox.showerror("Error", err or "Write failed.")
+        self.destroy()
+
+    def _stop_refresh(self):
+        if self._tick:
+            self.after_cancel(self._tick)
+            self._tick = None
+
     def _cancel(self):
+        self._stop_refresh()
         if self.task:
             self.task.cancel()
         self.destroy()
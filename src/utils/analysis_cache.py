@@ -0,0 +1,76 @@
+"""
+Persistent cache for per-file audio analysis results (ffprobe metadata, loudness, silences),
+and for compute_sha256's last digest of each directory ("checksum").
+
+Entries are keyed by namespace ("metadata", "loudness", "silence", "checksum"), file path and
+analysis parameters, and are only returned while the file's mtime and size match those recorded
+with the entry.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+import platformdirs
+
+CACHE_DIR = Path(platformdirs.user_cache_dir("VoxblockMaster"))
+CACHE_FILE = CACHE_DIR / "analysis.db"
+
+_conn = None
+_conn_pid = None
+_lock = threading.Lock()
+
+
+def _db():
+    """Opens the cache database once per process (a connection must not cross a fork)."""
+    global _conn, _conn_pid
+    if _conn is None or _conn_pid != os.getpid():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_FILE, timeout=5, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " ns TEXT, path TEXT, params TEXT, mtime_ns INTEGER, size INTEGER, value TEXT,"
+            " PRIMARY KEY (ns, path, params))"
+        )
+        _conn_pid = os.getpid()
+    return _conn
+
+
+def file_key(file_path):
+    """Returns (absolute path, mtime_ns, size) identifying the current contents of file_path."""
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+def get_cached(ns, key, params=""):
+    """Returns the cached value for key, or None if missing or the file has changed since."""
+    path, mtime_ns, size = key
+    try:
+        with _lock:
+            row = _db().execute(
+                "SELECT mtime_ns, size, value FROM results WHERE ns=? AND path=? AND params=?",
+                (ns, path, params),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logging.debug(f"Analysis cache read failed for {path}: {e}")
+        return None
+    if row is None or row[0] != mtime_ns or row[1] != size:
+        return None
+    return json.loads(row[2])
+
+
+def put_cached(ns, key, value, params=""):
+    """Stores a JSON-serialisable value for key, replacing any stale entry."""
+    path, mtime_ns, size = key
+    try:
+        with _lock:
+            conn = _db()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (ns, path, params, mtime_ns, size, value) VALUES (?, ?, ?, ?, ?, ?)",
+                (ns, path, params, mtime_ns, size, json.dumps(value)),
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        logging.debug(f"Analysis cache write failed for {path}: {e}")
@@ -1,8 +1,104 @@
 import ffmpeg
+import functools
 import logging
+import logging.handlers
+import multiprocessing
+import orjson
+import os
 import re
-import traceback
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from utils.analysis_cache import file_key, get_cached, put_cached
+
+# Only the probe fields extract_metadata reads, so ffprobe emits minimal JSON
+_PROBE_ENTRIES = "format=duration,format_name:format_tags:stream=codec_type,codec_name,sample_rate,bit_rate,channels,nb_frames"
+
+# Input options for every analysis run; batch workers pin decoding to one thread each
+_INPUT_ARGS = []
+
+# Analyses only ever look at the first audio stream, even in multi-stream containers (m4b, dual-language)
+_AUDIO_STREAM = "0:a:0"
+
+# Null sink shared by every analysis run: no video, subtitle or data streams (cover art, chapters),
+# and a fixed cheap audio codec so nothing is negotiated per file
+_NULL_SINK_ARGS = ("-vn", "-sn", "-dn", "-c:a", "pcm_s16le", "-f", "null", "-")
+
+# loudnorm summary fields, compiled once rather than per analyzed file; matched against raw
+# stderr bytes since every field is ASCII
+_LOUDNESS_PATTERNS = {
+    "input_i": re.compile(rb"Input Integrated:\s*(-?\d+\.?\d*)"),
+    "input_tp": re.compile(rb"Input True Peak:\s*([+-]?\d+\.?\d*)"),
+    "input_lra": re.compile(rb"Input LRA:\s*(\d+\.?\d*)"),
+    "input_thresh": re.compile(rb"Input Threshold:\s*(-?\d+\.?\d*)"),
+    "target_offset": re.compile(rb"Target Offset:\s*([+-]?\d+\.?\d*)")
+}
+
+_SILENCE_RE = re.compile(rb"silence_start:\s*([\d\.]+)")
+
+# Tests that decode the audio; anything else analyze_track does is an ffprobe call
+_DECODE_TESTS = {"loudness", "silence", "frame_errors"}
+
+def _test_list(tests):
+    """Normalizes tests (a comma-separated string or an iterable of names) to lower-case names."""
+    if not tests:
+        return []
+    test_list = tests.split(",") if isinstance(tests, str) else list(tests)
+    return [t.lower().strip() for t in test_list]
+
+def analyze_tracks(file_paths, params, tests, max_workers=None):
+    """
+    Runs analyze_track over many files in a process pool, one ffmpeg job per worker.
+    When no decoding test is requested the files are only probed, in this process.
+
+    Returns:
+        list: analyze_track results in the order of file_paths; None where a worker failed.
+    """
+    file_paths = list(file_paths)
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, 8)
+
+    if len(file_paths) <= 1 or max_workers <= 1:
+        return [analyze_track(path, params, tests) for path in file_paths]
+
+    # Probe everything up front (threaded) so the analysis finds the metadata in the cache
+    extract_metadata_batch(file_paths)
+
+    if not _DECODE_TESTS.intersection(_test_list(tests)):
+        # Metadata only: nothing left that is worth starting worker processes for
+        return [analyze_track(path, params, tests) for path in file_paths]
+
+    logging.debug(f"Analyzing {len(file_paths)} tracks with {max_workers} workers")
+    root = logging.getLogger()
+    # Worker records come back over a queue and go to this process's handlers (GUI log pane included)
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    listener.start()
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_analysis_worker,
+                                 initargs=(log_queue, root.getEffectiveLevel())) as pool:
+            futures = [pool.submit(analyze_track, path, params, tests) for path in file_paths]
+            for path, future in zip(file_paths, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logging.error(f"Track analysis worker failed for {path}: {e}")
+                    results.append(None)
+    finally:
+        listener.stop()  # handles everything the workers queued before returning
+        log_queue.close()
+    return results
+
+
+def _init_analysis_worker(log_queue, log_level):
+    """Process pool initializer: send log records to the parent process and run ffmpeg single-threaded."""
+    logger = logging.getLogger()
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(log_level)
+    _INPUT_ARGS[:] = ["-threads", "1"]  # workers already saturate the cores
+
 
 def analyze_track(file_path, params, tests):
     """
@@ -32,49 +128,251 @@ def analyze_track(file_path, params, tests):
 
     logging.info(f"Analyzing {file_path}: format={format_name}, codec={codec_name}, tests={tests}")
 
-    if tests:
-        test_list = tests.split(",") if isinstance(tests, str) else list(tests)
-        test_list = [t.lower().strip() for t in test_list]
+    test_list = _test_list(tests)
+    if test_list:
 
         # Selective test execution
+        run_loudness = run_silence = run_frame_errors = False
+
         if "loudness" in test_list:
             if format_name in ["mp3", "aac", "ogg"] or codec_name.startswith("mp3"):
-                results["loudness"] = analyze_loudness(file_path, params)
+                run_loudness = True
             else:
                 logging.info(f"Skipping loudness: unsupported format {format_name}")
                 results["errors"].append("Skipped loudness")
 
         if "silence" in test_list:
             if format_name in ["mp3", "aac", "ogg", "wav", "flac"]:
-                results["silences"] = detect_silence(file_path, params)
+                run_silence = True
             else:
                 logging.info(f"Skipping silence detection: unsupported format {format_name}")
                 results["errors"].append("Skipped silence detection")
 
         if "frame_errors" in test_list:
             if codec_name.startswith("mp3"):
-                results["frame_errors"] = check_frame_errors(file_path)
+                run_frame_errors = True
             else:
                 logging.info(f"Skipping frame error check: codec={codec_name} not frame-based")
                 results["errors"].append("Skipped frame error check")
 
+        # Results from an earlier run on the unchanged file need no decode at all
+        if run_loudness:
+            cached = _cached_result("loudness", file_path, _loudness_filter(params))
+            if cached is not None:
+                results["loudness"] = cached
+                run_loudness = False
+        if run_silence:
+            cached = _cached_result("silence", file_path, _silence_filter(params))
+            if cached is not None:
+                results["silences"] = cached
+                run_silence = False
+
+        # Decoding dominates, so when several tests are requested run them in one ffmpeg pass
+        fused = None
+        if run_loudness + run_silence + run_frame_errors > 1:
+            fused = analyze_combined(file_path, params, run_loudness, run_silence, run_frame_errors)
+
+        if fused is not None:
+            results.update(fused)
+        else:
+            if run_loudness:
+                results["loudness"] = analyze_loudness(file_path, params)
+            if run_silence:
+                results["silences"] = detect_silence(file_path, params)
+            if run_frame_errors:
+                results["frame_errors"] = check_frame_errors(file_path)
+
     return results
 
 
-def extract_metadata(file_path):
-    results = {
-        "duration": None,
-        "sample_rate": None,
-        "bit_rate": None,
-        "channels": None,
-        "tags": {},
-        "format_name": None,
-        "codec_name": None
+def analyze_combined(file_path, params, loudness=False, silence=False, frame_errors=False):
+    """
+    Runs the requested loudness, silence and frame error checks in a single ffmpeg decode.
+
+    When both loudness and silence are requested the decoded audio is fanned out with asplit,
+    so loudnorm and silencedetect each get the original samples from the one decoder. Frame
+    errors are counted from the error-level lines of the same stderr, tagged via
+    -loglevel level+info.
+
+    Returns:
+        dict: keys "loudness", "silences" and "frame_errors" for the checks that were run,
+        or None if ffmpeg failed (callers fall back to the single-check functions).
+    """
+    filters = []
+    if silence:
+        filters.append(_silence_filter(params))
+    if loudness:
+        filters.append(_loudness_filter(params))
+
+    if len(filters) == 2:
+        graph = f"[{_AUDIO_STREAM}]asplit=2[a][b];[a]{filters[0]}[sil];[b]{filters[1]}[loud]"
+        filter_args = ("-filter_complex", graph, "-map", "[sil]", "-map", "[loud]")
+    elif filters:
+        filter_args = ("-map", _AUDIO_STREAM, "-af", filters[0])
+    else:
+        filter_args = ("-map", _AUDIO_STREAM)
+
+    try:
+        proc = _run_ffmpeg(file_path, filter_args, loglevel="level+info" if frame_errors else None)
+        scan = _scan_stderr(proc, loudness, silence, frame_errors)
+    except Exception as e:
+        logging.warning(f"Warning: Combined analysis failed for {file_path}, running checks separately: {e}")
+        return None
+
+    results = {}
+    if loudness:
+        results["loudness"] = scan["loudness"]
+        _store_result("loudness", file_path, _loudness_filter(params), scan["loudness"])
+        logging.debug("Loudness analysis for %s:%s", file_path, results["loudness"])
+    if silence:
+        results["silences"] = scan["silences"]
+        _store_result("silence", file_path, _silence_filter(params), scan["silences"])
+        logging.debug("Checking %s for silence: %s", file_path, results["silences"])
+    if frame_errors:
+        results["frame_errors"] = scan["frame_errors"]
+        logging.debug("Checking %s for frame errors: %s", file_path, results["frame_errors"])
+    return results
+
+
+def _cached_result(ns, file_path, params_key, key=None):
+    """
+    Returns a stored metadata/loudness/silence result for the file as it is now, or None.
+    params_key is the filter string, so it changes whenever any analysis parameter does.
+    key is the file_key(file_path) when the caller already has it.
+    A cache that can't be opened or read is just a miss.
+    """
+    try:
+        return get_cached(ns, key or file_key(file_path), params_key)
+    except OSError:
+        return None
+
+
+def _store_result(ns, file_path, params_key, value, key=None):
+    try:
+        put_cached(ns, key or file_key(file_path), value, params_key)
+    except OSError as e:
+        logging.debug("Could not cache %s result for %s: %s", ns, file_path, e)
+
+
+def _loudness_filter(params):
+    target_lufs = params.get("target_lufs", -19)
+    return f"loudnorm=I={target_lufs}:TP=-1.5:LRA=11:print_format=summary"
+
+
+def _silence_filter(params):
+    silence_threshold = params.get('silence_threshold', 90)
+    min_silence_duration = params.get("min_silence_duration", 0.2)
+    return f"silencedetect=noise=-{silence_threshold}dB:d={min_silence_duration}"
+
+
+def _run_ffmpeg(file_path, filter_args=("-map", _AUDIO_STREAM), loglevel=None):
+    """
+    Starts ffmpeg decoding file_path through filter_args into the null sink, with stderr piped.
+
+    The argv is assembled directly rather than through ffmpeg-python's graph builder, which
+    rebuilt and stringified the same few nodes on every call.
+    """
+    args = ["ffmpeg", "-hide_banner", "-nostats"]
+    if loglevel:
+        args += ["-loglevel", loglevel]
+    args += [*_INPUT_ARGS, "-i", str(file_path), *filter_args, *_NULL_SINK_ARGS]
+    return subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def _stderr_lines(proc):
+    """
+    Yields the raw stderr lines (bytes) of a running ffmpeg process while it decodes.
+
+    Raises ffmpeg.Error (carrying the last few stderr lines) if ffmpeg exits non-zero.
+    """
+    tail = deque(maxlen=20)
+    try:
+        for raw in proc.stderr:
+            tail.append(raw)
+            yield raw
+    finally:
+        proc.stderr.close()
+        if proc.poll() is None:
+            proc.kill()  # consumer stopped early
+        proc.wait()
+    if proc.returncode:
+        raise ffmpeg.Error("ffmpeg", None, b"".join(tail))
+
+
+def _scan_stderr(proc, loudness=False, silence=False, frame_errors=False):
+    """
+    Parses loudnorm, silencedetect and error lines as ffmpeg writes them, so parsing overlaps
+    decoding and only the short loudnorm summary block is ever buffered.
+    """
+    silences = []
+    summary = None
+    error_count = 0
+
+    for line in _stderr_lines(proc):  # bytes; nothing here needs decoding
+        if silence:
+            match = _SILENCE_RE.search(line)
+            if match:
+                silences.append(float(match.group(1)))
+        if loudness:
+            if summary is not None:
+                summary.append(line)
+            elif b"[Parsed_loudnorm" in line:
+                summary = []
+        if frame_errors and (b"[error]" in line or b"[fatal]" in line or b"[panic]" in line):
+            error_count += 1
+
+    return {
+        "loudness": _parse_loudness(b"".join(summary or ())),
+        "silences": silences,
+        "frame_errors": error_count,
     }
 
-    probe = ffmpeg.probe(str(file_path))
 
-    format_data = probe.get("format", {})
+def extract_metadata(file_path):
+    """
+    Returns stream and format metadata for file_path.
+    Probes are cached in memory and on disk per (path, mtime, size), so unchanged files are not re-probed.
+    """
+    return dict(_extract_metadata_cached(*file_key(file_path)))
+
+
+def extract_metadata_batch(file_paths, max_workers=None):
+    """
+    Returns extract_metadata results for many files, in order; None where the probe failed.
+    Cache misses are probed concurrently, so ffprobe start-up costs overlap instead of adding up.
+    """
+    file_paths = list(file_paths)
+    if not file_paths:
+        return []
+
+    # Each probe mostly waits on process start-up and file I/O, so this is not tied to the core count
+    with ThreadPoolExecutor(max_workers=max_workers or 8) as pool:
+        futures = [pool.submit(extract_metadata, path) for path in file_paths]
+
+    results = []
+    for path, future in zip(file_paths, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logging.debug("Metadata probe failed for %s: %s", path, e)
+            results.append(None)
+    return results
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_metadata_cached(file_path, mtime_ns, size):
+    key = (file_path, mtime_ns, size)
+    results = _cached_result("metadata", file_path, "", key)
+    if results is None:
+        results = _probe_metadata(file_path)
+        _store_result("metadata", file_path, "", results, key)
+    return results
+
+
+def _probe_metadata(file_path):
+    probe = _ffprobe(file_path)
+
+    format_data = probe.get("format") or {}
     streams = probe.get("streams", [])
 
     if not isinstance(streams, list):
@@ -85,28 +383,53 @@ def extract_metadata(file_path):
     if not audio_stream:
         raise ValueError(f"No valid audio stream found in {file_path}")
 
-    results["format_name"] = format_data.get("format_name")
-    results["tags"] = format_data.get("tags", {})
-    results["sample_rate"] = try_parse_int(audio_stream.get("sample_rate"))
-    results["bit_rate"] = try_parse_int(audio_stream.get("bit_rate"))
-    results["channels"] = try_parse_int(audio_stream.get("channels"))
-    results["codec_name"] = audio_stream.get("codec_name")
-    results["duration"] = try_parse_float(format_data.get("duration"))
+    stream_get = audio_stream.get
+    sample_rate = _probe_int(stream_get("sample_rate"))
+
+    results = {
+        "duration": try_parse_float(format_data.get("duration")),
+        "sample_rate": sample_rate,
+        "bit_rate": _probe_int(stream_get("bit_rate")),
+        "channels": _probe_int(stream_get("channels")),
+        "tags": format_data.get("tags", {}),
+        "format_name": format_data.get("format_name"),
+        "codec_name": stream_get("codec_name")
+    }
 
     if results["duration"] is None:
         # Try estimating
-        frames = try_parse_int(audio_stream.get("nb_frames"))
-        rate = try_parse_int(audio_stream.get("sample_rate"))
-        if frames and rate:
-            results["duration"] = frames / rate
+        frames = _probe_int(stream_get("nb_frames"))
+        if frames and sample_rate:
+            results["duration"] = frames / sample_rate
             logging.info(f"Estimated duration from frames for {file_path}")
         else:
             logging.warning(f"Unable to determine duration for {file_path}")
 
-
     return results
 
 
+def _probe_int(value):
+    """ffprobe reports counts as ints or digit strings; checking beats raising on the common path."""
+    if type(value) is int:
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _ffprobe(file_path):
+    """
+    Runs ffprobe directly for the whitelisted audio stream and format entries and parses the
+    JSON bytes with orjson. Raises ffmpeg.Error on failure, as ffmpeg.probe did.
+    """
+    args = ["ffprobe", "-v", "error", "-select_streams", "a", "-show_entries", _PROBE_ENTRIES,
+            "-of", "json", str(file_path)]
+    proc = subprocess.run(args, capture_output=True)
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffprobe", proc.stdout, proc.stderr)
+    return orjson.loads(proc.stdout)
+
+
 def try_parse_float(value):
     try:
         return float(value) if value is not None else None
@@ -132,39 +455,22 @@ def analyze_loudness(file_path, params):
             target_offset: float
         }
     """
-    target_lufs = params.get("target_lufs", -19)
+    loudness_filter = _loudness_filter(params)
+    cached = _cached_result("loudness", file_path, loudness_filter)
+    if cached is not None:
+        return cached
 
     try:
-        result = ffmpeg.input(str(file_path)) \
-            .filter("loudnorm", I=str(target_lufs), TP="-1.5", LRA="11", print_format="summary") \
-            .output("null", f="null") \
-            .global_args("-hide_banner") \
-            .run(capture_stderr=True)
-
-        output = result[1].decode("utf-8")
-        # logging.debug(f"FFmpeg Output (Loudness): {output}")
-
-        # Parse the new-style loudnorm summary
-        metrics = {}
-
-        patterns = {
-            "input_i": r"Input Integrated:\s*(-?\d+\.?\d*)",
-            "input_tp": r"Input True Peak:\s*([+-]?\d+\.?\d*)",
-            "input_lra": r"Input LRA:\s*(\d+\.?\d*)",
-            "input_thresh": r"Input Threshold:\s*(-?\d+\.?\d*)",
-            "target_offset": r"Target Offset:\s*([+-]?\d+\.?\d*)"
-        }
+        proc = _run_ffmpeg(file_path, ("-map", _AUDIO_STREAM, "-af", loudness_filter))
+        metrics = _scan_stderr(proc, loudness=True)["loudness"]
+        _store_result("loudness", file_path, loudness_filter, metrics)
 
-        for key, pattern in patterns.items():
-            match = re.search(pattern, output)
-            metrics[key] = float(match.group(1)) if match else None
-
-        logging.debug(f"Loudness analysis for {file_path}:{metrics}")
+        logging.debug("Loudness analysis for %s:%s", file_path, metrics)
         return metrics
 
     except Exception as e:
-        tb = traceback.extract_tb(e.__traceback__)[-1]
-        logging.debug(f"Warning: Could not analyze loudness for {file_path} at {tb.filename}:{tb.lineno}: {e}")
+        # exc_info is only formatted if a DEBUG record is actually emitted
+        logging.debug("Warning: Could not analyze loudness for %s: %s", file_path, e, exc_info=True)
 
     return {
         "input_i": None,
@@ -174,6 +480,16 @@ def analyze_loudness(file_path, params):
         "target_offset": None
     }
 
+def _parse_loudness(output):
+    """Parses the new-style loudnorm summary from raw ffmpeg stderr bytes."""
+    metrics = {}
+
+    for key, pattern in _LOUDNESS_PATTERNS.items():
+        match = pattern.search(output)
+        metrics[key] = float(match.group(1)) if match else None
+
+    return metrics
+
 def detect_silence(file_path, params):
     """
     Detects silence in an audio file using FFmpeg.
@@ -187,30 +503,22 @@ def detect_silence(file_path, params):
     """
     silence_threshold = params.get('silence_threshold', 90)
     min_silence_duration = params.get("min_silence_duration", 0.2)
+    silence_filter = _silence_filter(params)
+    cached = _cached_result("silence", file_path, silence_filter)
+    if cached is not None:
+        return cached
 
     try:
-        logging.debug(f"Checking {file_path} for silence silence_threshold={silence_threshold}db min_silence_duration={min_silence_duration}s")
-        result = ffmpeg.input(str(file_path)) \
-            .filter("silencedetect", noise=f"-{silence_threshold}dB", d=min_silence_duration) \
-            .output("null", f="null") \
-            .global_args("-hide_banner") \
-            .run(capture_stderr=False)
-
-        if result[1]:
-            output = result[1].decode("utf-8")
-            logging.debug(f"FFmpeg Output (Silence Detection {silence_threshold}||{min_silence_duration}): {output}")
-
-            # Extract silence periods using regex
-            silence_matches = re.findall(r"silence_start:\s*([\d\.]+)", output)
-            silences = [float(match) for match in silence_matches]
-            logging.debug(f"Checking {file_path} for silence: {silences}")
-            return silences
-        else:
-            return None
+        logging.debug("Checking %s for silence silence_threshold=%sdb min_silence_duration=%ss", file_path, silence_threshold, min_silence_duration)
+        proc = _run_ffmpeg(file_path, ("-map", _AUDIO_STREAM, "-af", silence_filter))
+        silences = _scan_stderr(proc, silence=True)["silences"]
+        _store_result("silence", file_path, silence_filter, silences)
+        logging.debug("Checking %s for silence: %s", file_path, silences)
+        return silences
 
     except Exception as e:
-        tb = traceback.extract_tb(e.__traceback__)[-1]
-        logging.warning(f"Warning: Could not analyze silence for {file_path} at {tb.filename}:{tb.lineno}: {e}")
+        logging.warning("Warning: Could not analyze silence for %s: %s: %s", file_path, type(e).__name__, e)
+        logging.debug("Silence analysis traceback for %s", file_path, exc_info=True)
 
     return []
 
@@ -225,13 +533,14 @@ def check_frame_errors(file_path):
         int: Number of detected frame errors.
     """
     try:
-        error_result = ffmpeg.input(str(file_path)) \
-            .output("null", f="null") \
-            .global_args("-hide_banner", "-loglevel", "error") \
-            .run(capture_stderr=True)
-
-        frame_err_count = len(error_result[1].decode("utf-8").splitlines())
-        logging.debug(f"Checking {file_path} for frame errors: {frame_err_count}")
+        proc = _run_ffmpeg(file_path, loglevel="error")
+        stderr = proc.communicate()[1]
+        if proc.returncode:
+            raise ffmpeg.Error("ffmpeg", None, stderr)
+
+        # One error per line; count newlines on the raw bytes instead of decoding and splitting
+        frame_err_count = stderr.count(b"\n") + (1 if stderr and not stderr.endswith(b"\n") else 0)
+        logging.debug("Checking %s for frame errors: %s", file_path, frame_err_count)
         return frame_err_count
 
     except Exception as e:
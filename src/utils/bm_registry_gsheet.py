@@ -1,8 +1,11 @@
 # bm_registry_gsheet.py
-import os, math, time, shlex, subprocess, tempfile
-from typing import Dict, Optional, Set, Tuple
+import os, re, math, time, subprocess, tempfile, atexit, threading, functools
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import gspread
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # =================== Config ===================
 
@@ -20,15 +23,31 @@ SKIP_WATERMARK = os.environ.get("BM_SKIP_WATERMARK") == "1"
 
 # =================== Sheets helpers ===================
 
+_GC: Optional[gspread.Client] = None
 _WKS = None
-_OCC_CACHE: Optional[Set[str]] = None
-_OCC_CACHE_AT: float = 0.0
-_OCC_TTL = 15  # seconds
+_CACHE: Dict[str, Tuple[float, Any]] = {}  # key -> (monotonic time loaded, value)
+_CACHE_TTL = 15  # seconds
 
 def _gc() -> gspread.Client:
-    gc = gspread.service_account(filename=os.environ["GOOGLE_APPLICATION_CREDENTIALS"])
-    gc.set_timeout(10)  # seconds
-    return gc
+    """
+    One authorized client per process: credentials are parsed once and the HTTP session
+    keeps its TLS connection alive across Sheets calls.
+    """
+    global _GC
+    if _GC is None:
+        gc = gspread.service_account(filename=os.environ["GOOGLE_APPLICATION_CREDENTIALS"])
+        gc.set_timeout(10)  # seconds
+        # gspread 6 keeps the session on http_client; 5.x on the client itself
+        session = getattr(getattr(gc, "http_client", None), "session", None) or getattr(gc, "session", None)
+        if session is not None:
+            # urllib3's default allowed methods exclude POST, so appends are never replayed
+            retry = Retry(total=3, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504))
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+            # Google APIs only gzip responses when asked and the User-Agent mentions gzip
+            session.headers["Accept-Encoding"] = "gzip"
+            session.headers["User-Agent"] = f'{session.headers.get("User-Agent", "bookmaster")} (gzip)'
+        _GC = gc
+    return _GC
 
 def _wks():
     global _WKS
@@ -37,94 +56,181 @@ def _wks():
         _WKS = sh.worksheet(TAB_NAME)
     return _WKS
 
-def ensure_header():
-    wks = _wks()
-    head = wks.row_values(1)
-    if head != HEADER:
-        wks.update("A1", [HEADER])
+def _cached(key: str, loader: Callable[[], Any], ttl: float = _CACHE_TTL, force_refresh: bool = False) -> Any:
+    """Return the cached value for key if younger than ttl, else load and store it."""
+    now = time.monotonic()
+    hit = _CACHE.get(key)
+    if not force_refresh and hit is not None and (now - hit[0]) < ttl:
+        return hit[1]
+    value = loader()
+    _CACHE[key] = (now, value)
+    return value
+
+def _invalidate_cache():
+    _CACHE.clear()
+
+@dataclass
+class SheetState:
+    """One batch_get snapshot of the registry: header row, column B (sku) and column F (used_mib_1dp)."""
+    header: List[str]
+    skus: List[str]
+    used_1dp: List[str]
+
+def _fetch_sheet_state() -> SheetState:
+    """
+    Read header, SKU column and slot column in a single values.batchGet request.
+    """
+    last_col = chr(ord("A") + len(HEADER) - 1)
+    header, skus, used = _wks().batch_get([f"A1:{last_col}1", "B2:B", "F2:F"])
+
+    def _column(rows) -> List[str]:
+        # blank cells come back as empty rows; trailing blanks are dropped entirely
+        return [str(r[0]) if r else "" for r in rows]
+
+    return SheetState(
+        header=[str(v) for v in header[0]] if header else [],
+        skus=_column(skus),
+        used_1dp=_column(used),
+    )
+
+def _sheet_state(force_refresh: bool = False) -> SheetState:
+    """Header, SKU and slot columns, shared by all readers for _CACHE_TTL seconds."""
+    return _cached("sheet_state", _fetch_sheet_state, force_refresh=force_refresh)
+
+def ensure_header(state: Optional[SheetState] = None, force_refresh: bool = False):
+    if state is None:
+        state = _sheet_state(force_refresh)
+    if state.header != HEADER:
+        _wks().update("A1", [HEADER])
+        _invalidate_cache()
 
 def append_row(row: Dict[str, str]):
-    wks = _wks()
-    wks.append_row([str(row.get(h, "")) for h in HEADER], value_input_option="RAW")
+    """Append one row to the sheet; raises if the append fails."""
+    _wks().append_rows([[str(row.get(h, "")) for h in HEADER]],
+                       value_input_option="RAW", insert_data_option="INSERT_ROWS")
+    _invalidate_cache()  # the sheet now holds a row the snapshot lacks
+
+# Values already written as canonical one-decimal strings ("59.4"), which is what this module logs
+_RE_1DP = re.compile(r"(?:0|[1-9]\d*)\.\d")
 
 def _coerce_1dp_str(v) -> Optional[str]:
     s = str(v).strip()
     if not s:
         return None
+    if _RE_1DP.fullmatch(s):
+        return s  # already rounded; skip the float round-trip
     try:
         f = float(s)
     except ValueError:
         return None
     # half-up to one decimal place
-    return f"{(math.floor(f*10 + 0.5)/10.0):.1f}"
+    return f"{_tenths_half_up(f) / 10:.1f}"
 
 def get_occupied_slots_1dp(force_refresh: bool = False) -> Set[str]:
     """
     Return {'59.4','60.6',...} from column F (used_mib_1dp).
-    Cached to avoid repeated calls within one run.
+    Read from the cached sheet snapshot to avoid repeated calls within one run.
     """
-    global _OCC_CACHE, _OCC_CACHE_AT
-    now = time.time()
-    if (not force_refresh) and _OCC_CACHE is not None and (now - _OCC_CACHE_AT) < _OCC_TTL:
-        return _OCC_CACHE
-    col = _wks().col_values(6)[1:]  # F2:F
-    occ = {s for s in (_coerce_1dp_str(v) for v in col) if s}
-    _OCC_CACHE, _OCC_CACHE_AT = occ, now
-    return occ
-
-def find_sku_row(sku: str) -> Tuple[Optional[int], Optional[float]]:
+    col = _sheet_state(force_refresh).used_1dp  # F2:F
+    return {s for s in (_coerce_1dp_str(v) for v in col) if s}
+
+def find_sku_row(sku: str, state: Optional[SheetState] = None,
+                 force_refresh: bool = False) -> Tuple[Optional[int], Optional[float]]:
     """
     Return (row_index, recorded_used_mib_1dp) for existing SKU, or (None, None) if not found.
     Row index is 1-based; data starts at row 2.
     """
-    wks = _wks()
-    skus = wks.col_values(2)  # column B (sku), including header
-    for idx, val in enumerate(skus[1:], start=2):
+    if state is None:
+        state = _sheet_state(force_refresh)
+    for idx, val in enumerate(state.skus, start=2):
         if val.strip() == sku:
-            used_1dp_str = _coerce_1dp_str(wks.cell(idx, 6).value)  # F
+            pos = idx - 2
+            used_1dp_str = _coerce_1dp_str(state.used_1dp[pos]) if pos < len(state.used_1dp) else None  # F
             return idx, (float(used_1dp_str) if used_1dp_str else None)
     return None, None
 
 # =================== mtools + measurement ===================
 
-def _run(cmd: str, timeout: float = 5.0) -> str:
+_RUN_ENV = {**os.environ, "LC_ALL": "C", "LANG": "C"}
+
+def _run(argv: List[str], timeout: float = 5.0) -> str:
     """
-    Run a shell command with neutral C locale and hard timeout.
+    Run a command (argv list, no shell parsing) with neutral C locale and hard timeout.
     """
-    env = {**os.environ, "LC_ALL": "C", "LANG": "C"}
     try:
         p = subprocess.run(
-            shlex.split(cmd),
+            argv,
             capture_output=True,
-            env=env,
+            env=_RUN_ENV,
             timeout=timeout,
         )
     except subprocess.TimeoutExpired:
-        raise RuntimeError(f"Command timed out after {timeout}s: {cmd}")
+        raise RuntimeError(f"Command timed out after {timeout}s: {' '.join(argv)}")
     if p.returncode != 0:
         err = p.stderr.decode("utf-8", "replace") if p.stderr else ""
-        raise RuntimeError(f"Command failed: {cmd}\n{err}")
+        raise RuntimeError(f"Command failed: {' '.join(argv)}\n{err}")
     return p.stdout.decode("utf-8", "replace") if p.stdout else ""
 
+def _tenths_half_up(x: float) -> int:
+    """x rounded half-up to whole tenths (59.44 -> 594), as an int for exact slot arithmetic."""
+    return math.floor(x * 10 + 0.5)
+
 def _round_1dp_half_up(x: float) -> float:
-    return math.floor(x * 10 + 0.5) / 10.0
+    return _tenths_half_up(x) / 10.0
+
+# image_path -> ((mtime_ns, size), free_bytes). The image size never changes and mtime may be
+# coarse, so every mtools write below also drops its entry explicitly.
+_FREE_CACHE: Dict[str, Tuple[Tuple[int, int], Optional[int]]] = {}
+
+def _invalidate_free_bytes(image_path: str):
+    _FREE_CACHE.pop(image_path, None)
 
 def _mdir_free_bytes(image_path: str) -> Optional[int]:
-    out = _run(f'mdir -i "{image_path}" ::')
+    st = os.stat(image_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _FREE_CACHE.get(image_path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+
+    free = None
+    out = _run(["mdir", "-i", image_path, "::"])
     for ln in reversed(out.splitlines()):
         if "bytes free" in ln:
             digits = "".join(ch for ch in ln.split("bytes free")[0] if ch.isdigit())
-            return int(digits) if digits else None
-    return None
+            free = int(digits) if digits else None
+            break
+    _FREE_CACHE[image_path] = (stamp, free)
+    return free
+
+_MINFO_SECTOR_RE  = re.compile(r"sector size:\s*(\d+)")
+_MINFO_CLUSTER_RE = re.compile(r"cluster size:\s*(\d+)\s*sectors")
+
+def _cluster_bytes(image_path: str) -> Optional[int]:
+    """FAT allocation unit of the image in bytes (from minfo), or None if it can't be read."""
+    return _cluster_bytes_cached(image_path, os.path.getsize(image_path))
 
-def measure_used_total(image_path: str) -> Dict[str, float]:
+@functools.lru_cache(maxsize=32)
+def _cluster_bytes_cached(image_path: str, image_size: int) -> Optional[int]:
+    try:
+        out = _run(["minfo", "-i", image_path, "::"])
+    except Exception:
+        return None
+    sector = _MINFO_SECTOR_RE.search(out)
+    cluster = _MINFO_CLUSTER_RE.search(out)
+    if not (sector and cluster):
+        return None
+    return int(sector.group(1)) * int(cluster.group(1))
+
+def measure_used_total(image_path: str, total_bytes: Optional[int] = None) -> Dict[str, float]:
     """
     Measure via mdir only (robust): used = image_file_size - free_bytes_from_mdir.
+    Pass total_bytes when the caller already knows the image file size to skip another stat.
     """
     free_bytes = _mdir_free_bytes(image_path)
     if free_bytes is None:
         raise RuntimeError("Could not read free bytes from mtools (mdir).")
-    total_bytes = os.path.getsize(image_path)
+    if total_bytes is None:
+        total_bytes = os.path.getsize(image_path)
     used_bytes  = max(0, total_bytes - free_bytes)
     used_mib  = used_bytes  / (1024.0 * 1024.0)
     total_mib = total_bytes / (1024.0 * 1024.0)
@@ -144,22 +250,22 @@ def sanitize_image(image_path: str):
     Remove macOS junk from the FAT image (without mounting).
     Safe to run multiple times; ignores missing paths.
     """
-    def _silent(cmd):
-        try: _run(cmd)
+    def _silent(argv):
+        # mtools keeps going past arguments that match nothing, but then exits non-zero
+        try: _run(argv)
         except Exception: pass
 
-    # Remove common macOS junk files
-    for pat in ["::/.DS_Store", "::/*/.DS_Store", "::/._*", "::/*/._*"]:
-        _silent(f'mdel -s -i "{image_path}" "{pat}"')
+    # Remove common macOS junk files (one mdel for all patterns)
+    _silent(["mdel", "-s", "-i", image_path, "::/.DS_Store", "::/*/.DS_Store", "::/._*", "::/*/._*"])
 
-    # Attempt to remove known junk directories (must be empty)
-    for _ in range(2):
-        for d in [
-            "::/.Spotlight-V100", "::/.fseventsd", "::/.Trashes",
-            "::/.TemporaryItems", "::/.DocumentRevisions-V100",
-            "::/System Volume Information"
-        ]:
-            _silent(f'mrd -i "{image_path}" "{d}"')
+    # Attempt to remove known junk directories (must be empty). A single mrd covers them all:
+    # nothing changes between attempts, so a repeat pass could never succeed where this failed,
+    # and mtools must not be run concurrently against the same image.
+    _silent(["mrd", "-i", image_path,
+             "::/.Spotlight-V100", "::/.fseventsd", "::/.Trashes",
+             "::/.TemporaryItems", "::/.DocumentRevisions-V100",
+             "::/System Volume Information"])
+    _invalidate_free_bytes(image_path)
 
 def make_readonly(image_path: str):
     """
@@ -175,30 +281,48 @@ def make_readonly(image_path: str):
 
 # =================== Nudge (rough, single-shot) ===================
 
+_PAD_SOURCE: Optional[str] = None  # one sparse source file, resized for every pad write
+_PAD_LOCK = threading.Lock()
+
+def _remove_pad_source():
+    if _PAD_SOURCE:
+        try: os.remove(_PAD_SOURCE)
+        except OSError: pass
+
+def _pad_source(size_bytes: int) -> str:
+    """Return the shared pad source file, truncated (sparse) to exactly size_bytes."""
+    global _PAD_SOURCE
+    if _PAD_SOURCE is None or not os.path.exists(_PAD_SOURCE):
+        fd, _PAD_SOURCE = tempfile.mkstemp(prefix="pad_")
+        os.close(fd)
+        atexit.register(_remove_pad_source)
+    with open(_PAD_SOURCE, "r+b") as f:
+        f.truncate(max(0, size_bytes))
+    return _PAD_SOURCE
+
 def _write_pad(image_path: str, dos_file: str, size_bytes: int):
     """
     Write pad file into the FAT image. Try bookInfo/.dup_sig; if that fails, fall back to root /.dup_sig.
     """
-    def _write(dos_path: str):
-        with tempfile.NamedTemporaryFile(prefix="pad_", delete=False) as tf:
-            tmp = tf.name
-        try:
-            with open(tmp, "wb") as f:
-                if size_bytes > 0:
-                    f.truncate(size_bytes)
-            _run(f'mcopy -o -i "{image_path}" "{tmp}" "{dos_path}"')
-        finally:
-            try: os.remove(tmp)
-            except OSError: pass
+    with _PAD_LOCK:
+        src = _pad_source(size_bytes)
 
-    try:
-        _write(dos_file)  # try ::/bookInfo/.dup_sig
-    except Exception:
-        _write("::/.dup_sig")  # fallback to root
+        def _write(dos_path: str):
+            try:
+                _run(["mcopy", "-o", "-i", image_path, src, dos_path])
+            finally:
+                _invalidate_free_bytes(image_path)
+
+        try:
+            _write(dos_file)  # try ::/bookInfo/.dup_sig
+        except Exception:
+            _write("::/.dup_sig")  # fallback to root
 
 def _nudge_single_shot(image_path: str, target_1dp: float, overall_timeout_s: float = 10.0) -> float:
     """
     One-shot center-of-band pad write, with tiny ± refinements.
+    The pad is sized in whole FAT clusters, which is how it is allocated, so the
+    centre shot normally lands first time and the refinements are only a fallback.
     No ensure_dir; fast and robust.
     """
     t0 = time.time()
@@ -232,8 +356,11 @@ def _nudge_single_shot(image_path: str, target_1dp: float, overall_timeout_s: fl
         print(f"[registry] {elapsed()} used≥upper after reset; cannot reduce; stopping", flush=True)
         return _round_1dp_half_up(m1["used_mib"])
 
-    # Single-shot to band center
+    # Single-shot to band center; the pad occupies whole clusters, so round to the nearest one
     need = int(max(0, center - m1["used_bytes"]))
+    cluster = _cluster_bytes(image_path)
+    if cluster:
+        need = round(need / cluster) * cluster
     print(f"[registry] {elapsed()} writing pad {need} bytes (center shot)…", flush=True)
     _write_pad(image_path, pad, need)
 
@@ -268,16 +395,16 @@ def choose_free_slot(measured_1dp: float, max_cap_1dp: Optional[float] = None, s
     Pick the first free 0.1 MiB slot at or ABOVE measured_1dp, optionally bounded by capacity.
     """
     occupied = get_occupied_slots_1dp()
-    base = _round_1dp_half_up(measured_1dp)
-    cap  = _round_1dp_half_up(max_cap_1dp) if max_cap_1dp is not None else None
+    # Walk the candidates in integer tenths; only the membership test needs the "59.4" form
+    base_t = _tenths_half_up(measured_1dp)
+    cap_t  = _tenths_half_up(max_cap_1dp) if max_cap_1dp is not None else None
 
-    for i in range(0, span + 1):
-        candidate = _round_1dp_half_up(base + 0.1 * i)
-        if cap is not None and candidate > cap:
+    for t in range(base_t, base_t + span + 1):
+        if cap_t is not None and t > cap_t:
             break
-        if f"{candidate:.1f}" not in occupied:
-            return candidate
-    return base  # nothing free within span/cap; don't move down
+        if f"{t / 10:.1f}" not in occupied:
+            return t / 10
+    return base_t / 10  # nothing free within span/cap; don't move down
 
 # =================== Optional guard ===================
 
@@ -302,24 +429,27 @@ def assert_matches_registry_or_fix(image_path: str, sku: str) -> None:
 
 def claim_unique_slot_and_log(image_path: str, sku: str) -> Dict[str, str]:
     """
-    1) Ensure header.
+    1) Ensure header (header, SKU and slot columns are read in one batch request).
     2) Sanitize, then measure.
     3) If SKU exists and its recorded slot is reachable (>= measured and <= capacity),
        reuse it and DO NOT append (one row per SKU).
        Else pick next free slot at/above measured and (unless skip) nudge to it, then append.
     4) Finally, make the image read-only (immutable).
     """
-    ensure_header()
+    state = _sheet_state(force_refresh=True)  # fresh at the start of every claim; later reads reuse it
+    ensure_header(state)
 
     # Always sanitize first to remove OS junk if someone mounted the image
     sanitize_image(image_path)
 
-    m0 = measure_used_total(image_path)
+    # The image file never changes size (mtools writes inside it), so stat it once for the whole claim
+    file_size_bytes = os.path.getsize(image_path)
+    m0 = measure_used_total(image_path, file_size_bytes)
     measured_1dp = m0["used_mib_1dp"]
     total_1dp    = m0["total_mib_1dp"]
 
     # Check for existing SKU row
-    row_idx, existing_slot = find_sku_row(sku)
+    row_idx, existing_slot = find_sku_row(sku, state)
     reuse = False
     target_1dp: float
 
@@ -346,7 +476,7 @@ def claim_unique_slot_and_log(image_path: str, sku: str) -> Dict[str, str]:
         start = time.time()
         landed = _nudge_single_shot(image_path, target_1dp, overall_timeout_s=10.0)
         print(f"[registry] landed at {landed:.1f}MiB; nudge took {time.time()-start:.2f}s; re-measuring…", flush=True)
-        m = measure_used_total(image_path)
+        m = measure_used_total(image_path, file_size_bytes)
 
     # If reusing an existing SKU, ensure image still matches the registered slot after sanitize/nudge
     if reuse:
@@ -369,7 +499,7 @@ def claim_unique_slot_and_log(image_path: str, sku: str) -> Dict[str, str]:
             "total_mib_1dp": f'{m["total_mib_1dp"]:.1f}',
 
             "volume_label": sku[:11].upper(),
-            "file_size_bytes": os.path.getsize(image_path),
+            "file_size_bytes": file_size_bytes,
         }
         print("[registry] appending row to sheet…", flush=True)
         append_row(row)
@@ -393,5 +523,5 @@ def claim_unique_slot_and_log(image_path: str, sku: str) -> Dict[str, str]:
             "total_mib_1dp": f'{m["total_mib_1dp"]:.1f}',
 
             "volume_label": sku[:11].upper(),
-            "file_size_bytes": os.path.getsize(image_path),
+            "file_size_bytes": file_size_bytes,
         }
@@ -2,13 +2,18 @@ import logging
 
 import sys
 import tkinter as tk
+from collections import deque
 
 class TextHandler(logging.Handler):
     """Custom logging handler to redirect logs to a Tkinter Text widget with colors."""
+    FLUSH_MS = 50  # records arriving within this window are written to the widget in one batch
+
     def __init__(self, text_widget):
         super().__init__()
         self.text_widget = text_widget
         self.text_widget.configure(state='normal')
+        self._pending = deque()  # (text, level) pairs; deque appends are thread-safe
+        self._scheduled = False  # a _flush is queued on the Tk loop
 
         self.colors = {
             "DEBUG": "gray",
@@ -21,11 +26,40 @@ class TextHandler(logging.Handler):
         for level, color in self.colors.items():
             self.text_widget.tag_config(level, foreground=color)
 
+    def handle(self, record):
+        # Skips the handler lock: the deque needs none, and a worker thread's after() call waits on
+        # the Tk loop, which would deadlock against a record logged on the Tk thread meanwhile
+        rv = self.filter(record)
+        if rv:
+            self.emit(rv if isinstance(rv, logging.LogRecord) else record)
+        return rv
+
     def emit(self, record):
-        """Write formatted log message to the Tkinter Text widget with color."""
-        log_entry = self.format(record) + "\n"
-        self.text_widget.insert("end", log_entry, record.levelname)
-        self.text_widget.see("end")  # Auto-scroll
+        """Queue the formatted log message; _flush writes it to the widget with its level's color."""
+        self._pending.append((self.format(record) + "\n", record.levelname))
+        # Only the first record into an idle queue schedules a flush; the Tk loop does the writing,
+        # which also keeps records emitted by worker threads off the widget directly
+        if self._scheduled:
+            return
+        self._scheduled = True
+        try:
+            self.text_widget.after(self.FLUSH_MS, self._flush)
+        except (tk.TclError, RuntimeError):
+            self._scheduled = False  # widget destroyed or Tk loop not running; a later record retries
+
+    def _flush(self):
+        """Insert every pending record with a single insert call and scroll once."""
+        self._scheduled = False  # cleared first, so a record queued after the drain schedules again
+        chunks = []
+        while self._pending:
+            chunks.extend(self._pending.popleft())  # insert takes alternating text, tag arguments
+        if not chunks:
+            return
+        try:
+            self.text_widget.insert("end", *chunks)
+            self.text_widget.see("end")  # Auto-scroll
+        except tk.TclError:
+            pass  # widget destroyed
 
 
 
@@ -6,12 +6,39 @@ import subprocess
 import random
 import ffmpeg
 import re, os
+import functools
+import fnmatch
+import mmap
+import stat
+import threading
+import uuid
 from mutagen.mp3 import MP3
-from mutagen.id3 import ID3
+from mutagen.id3 import ID3, ID3NoHeaderError
 from mutagen.wave import WAVE
 import logging
-from itertools import chain
-from natsort import natsorted
+from itertools import islice
+from collections import deque
+from natsort import natsort_keygen
+from concurrent.futures import ThreadPoolExecutor
+from utils.analysis_cache import get_cached, put_cached
+
+# How many upcoming files compute_sha256 pulls into the page cache while hashing the current one
+HASH_PREFETCH_FILES = 4
+# Below this size a plain read() + update() beats setting up and tearing down an mmap
+HASH_MMAP_MIN_BYTES = 64 * 1024
+# Read size when a file can't be mapped: 1 MiB per readinto() keeps syscalls few on USB reads
+HASH_READ_BUFSIZE = 1 << 20
+_MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+_HAS_FADVISE = hasattr(os, "posix_fadvise")  # Linux/BSD; not macOS or Windows
+# Natural-order key on a path's string, built once rather than on every compute_sha256 call
+_PATH_NATSORT_KEY = natsort_keygen(key=str)
+# Recent compute_sha256 results, keyed on the ordered files' (path, inode, size, mtime, ctime) and
+# base path, so re-hashing an unchanged set of files (e.g. re-validating a drive) reads nothing.
+# The last digest per base path is also kept in the analysis cache, so this holds across runs.
+HASH_MEMO_SIZE = 16
+_HASH_MEMO = {}
+_HASH_MEMO_LOCK = threading.Lock()
+_PREFETCH_LOCAL = threading.local()  # per reader thread scratch buffer, see _prefetch_file
 
 EXCLUDED_PATTERNS = {".fseventsd", ".Spotlight-V100", ".Trashes", ".DS_Store", "version.txt", "checksum.txt"}
 
@@ -28,34 +55,54 @@ def probe_metadata(audio_file):
 def get_metadata_from_audio(audio_file):
     """Extracts author and title metadata from MP3 and WAV files using ffmpeg-python for WAV."""
     try:
-        if audio_file.lower().endswith(".mp3"):
-            audio = MP3(audio_file, ID3=ID3)
-            tags = audio.tags
-            logging.debug(f"Getting tags from {audio_file}, {tags}")
-
-            if tags:
-                author = tags.get("TPE1", [""])[0]  # MP3: Performer/Author
-                title = tags.get("TIT2", [""])[0]   # MP3: Track Title
-                return author, title
-
-        elif audio_file.lower().endswith(".wav"):
-            tags = probe_metadata(audio_file)  # Use ffmpeg-python for WAV metadata
-            logging.debug(f"Getting tags from {audio_file}, {tags}")
-
-            if tags:
-                author = tags.get("artist", "")  # WAV: Artist (Author)
-                title = tags.get("title", "")   # WAV: Title
-                logging.debug(f"Found tags {author}, {title}")
-                return author, title
-
+        st = os.stat(audio_file)
+        # cached per file version, so re-validating an unchanged master doesn't re-parse or re-probe
+        return _read_author_title(audio_file, st.st_mtime_ns, st.st_size)
     except Exception as e:
         logging.error(f"Error reading metadata from {audio_file}: {e}")
 
     return None, None  # Return None if metadata is missing or invalid
 
+@functools.lru_cache(maxsize=1024)
+def _read_author_title(audio_file, mtime_ns, size):
+    if audio_file.lower().endswith(".mp3"):
+        # Read the ID3 tag alone; MP3() would also parse the audio stream, which is not needed here
+        try:
+            tags = ID3(audio_file)
+        except ID3NoHeaderError:
+            tags = None
+        logging.debug(f"Getting tags from {audio_file}, {tags}")
+
+        if tags:
+            author = tags.get("TPE1", [""])[0]  # MP3: Performer/Author
+            title = tags.get("TIT2", [""])[0]   # MP3: Track Title
+            return author, title
+
+    elif audio_file.lower().endswith(".wav"):
+        tags = probe_metadata(audio_file)  # Use ffmpeg-python for WAV metadata
+        logging.debug(f"Getting tags from {audio_file}, {tags}")
+
+        if tags:
+            author = tags.get("artist", "")  # WAV: Artist (Author)
+            title = tags.get("title", "")   # WAV: Title
+            logging.debug(f"Found tags {author}, {title}")
+            return author, title
+
+    return None, None
+
+# Deletes ASCII digits, so a translated ISBN-13 is empty only if it was all digits
+_ISBN_TABLE = str.maketrans("", "", "0123456789")
+
+def is_isbn13(value):
+    """Returns True if value is exactly 13 ASCII digits."""
+    return len(value) == 13 and not value.translate(_ISBN_TABLE)
+
 def generate_isbn():
     return str(random.randint(1000000000000, 9999999999999))
 
+# First letter of each word of a title
+_TITLE_INITIAL_RE = re.compile(r"\b\w")
+
 def generate_sku(author, title, isbn):
     """Generates SKU in the format BK-XXXXX-ABCD where AB is from author, CD from title."""
     logging.debug(f"Creating sku from {author}, {title}, {isbn}")
@@ -71,7 +118,7 @@ def generate_sku(author, title, isbn):
     # Extract title initials (CD)
     title_abbr = "YY"
     if title:
-        words = re.findall(r"\b\w", title)  # Get first letter of each word
+        words = [m.group() for m in islice(_TITLE_INITIAL_RE.finditer(title), 2)]  # First letters of the first two words
         if len(words) >= 2:
             title_abbr = (words[0] + words[1]).upper()  # First two letters from title
         elif words:
@@ -86,15 +133,26 @@ def get_first_audiofile(input_folder, valid_formats=["*.mp3", "*.wav"]):
     if not folder_path.is_dir():
         raise ValueError(f"Invalid directory: {input_folder}")
 
-    # Get all valid audio files and sort them naturally
-    audio_files = sorted(chain.from_iterable(folder_path.glob(ext) for ext in valid_formats))
+    # One directory pass keeping the lowest matching name, instead of a glob per format plus a full sort
+    first = None
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            name = entry.name
+            if (first is None or name < first) and any(fnmatch.fnmatchcase(name, ext) for ext in valid_formats):
+                first = name
 
-    logging.debug(f"Getting first file, found: {audio_files}")
+    logging.debug(f"Getting first file, found: {first}")
 
-    return str(audio_files[0]) if audio_files else None  # Return first audio file or None
+    return str(folder_path / first) if first is not None else None  # Return first audio file or None
 
 def parse_time_to_minutes(time_str):
     """Convert HH:MM to total minutes as a float."""
+    hours, sep, minutes = time_str.partition(":")
+    if sep:
+        try:
+            return int(hours) * 60.0 + int(minutes)  # common case: whole hours and minutes
+        except ValueError:
+            pass  # fractional parts, extra fields or junk: the general parse below decides
     try:
         hours, minutes = map(float, time_str.split(":"))
         return hours * 60 + minutes  # Convert to total minutes
@@ -107,20 +165,147 @@ def is_excluded(path, excluded_patterns=EXCLUDED_PATTERNS):
     Returns True if any part of the path matches an excluded pattern.
     Accepts a Path object or string.
     """
-    path = Path(path)
+    if not isinstance(path, Path):
+        path = Path(path)
+    if isinstance(excluded_patterns, (set, frozenset)):
+        return not excluded_patterns.isdisjoint(path.parts)  # one C-level pass over the components
     return any(part in excluded_patterns for part in path.parts)
 
-def compute_sha256(file_paths, base_path=None):
+def _update_hash_from_file(hasher, file_path, drop_cache=False):
+    """
+    Feeds a file's bytes to hasher with a single update() over a read-only mmap, so the whole
+    file is hashed in C (GIL released) rather than in a Python read loop. Same digest as chunked reads.
+    hashlib's sha256 is OpenSSL's, which uses the CPU's SHA extensions where present.
+    With drop_cache, the file's pages are released from the page cache once it has been hashed.
+    """
+    with file_path.open("rb", buffering=0) as f:
+        fd = f.fileno()
+        size = os.fstat(fd).st_size
+        if size < HASH_MMAP_MIN_BYTES:
+            # small files (bookInfo/*.txt and the like): one read is cheaper than map + unmap,
+            # and mmap cannot map an empty file anyway
+            if size:
+                hasher.update(f.read())
+            return
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except OSError:
+            # some FUSE/network mounts can't be mapped: let file_digest run the read loop in C,
+            # with the read-ahead window widened for this descriptor
+            if _HAS_FADVISE:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            hashlib.file_digest(f, lambda: hasher, _bufsize=HASH_READ_BUFSIZE)
+        else:
+            with mm:
+                if _MADV_SEQUENTIAL is not None:
+                    # aggressive kernel readahead: the next pages are read while these are hashed
+                    mm.madvise(_MADV_SEQUENTIAL)
+                hasher.update(mm)
+        if drop_cache and _HAS_FADVISE:
+            # hashed once and not read again: don't let a whole drive's tracks evict useful pages
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _prefetch_file(file_path):
+    """Pulls a file into the OS page cache ahead of hashing; errors are left to the hashing pass."""
+    try:
+        with file_path.open("rb", buffering=0) as f:
+            if _HAS_FADVISE:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                return
+            # no fadvise (macOS): read it through. Each reader thread keeps one scratch buffer
+            # for all its files instead of allocating 1 MiB per file
+            buf = getattr(_PREFETCH_LOCAL, "buf", None)
+            if buf is None:
+                buf = _PREFETCH_LOCAL.buf = bytearray(HASH_READ_BUFSIZE)
+            while f.readinto(buf):
+                pass
+    except OSError:
+        pass
+
+
+def iter_files(root):
+    """
+    Yields a Path for every file under root, like rglob("*") filtered with is_file(), from one
+    os.scandir walk: DirEntry knows each entry's type from the listing, so nothing is stat'ed
+    (except symlinks, which is_file() follows). Symlinked directories are not descended into.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file():
+                yield Path(entry.path)
+
+
+def iter_prefetched(paths, depth=HASH_PREFETCH_FILES):
+    """
+    Yields paths in order while reader threads pull the next `depth` files into the page cache,
+    so a serial consumer (a chained digest) overlaps its hashing with several outstanding reads.
+    paths may be a lazy iterable (e.g. a directory walk): only `depth` paths are held at a time,
+    so hashing starts with the first file rather than after the whole listing.
+    """
+    it = iter(paths)
+    with ThreadPoolExecutor(max_workers=depth) as pool:
+        window = deque(islice(it, depth))
+        for file_path in window:
+            pool.submit(_prefetch_file, file_path)
+
+        while window:
+            file_path = window.popleft()
+            ahead = next(it, None)
+            if ahead is not None:
+                pool.submit(_prefetch_file, ahead)
+                window.append(ahead)
+            yield file_path
+
+
+def _common_parent(paths):
+    """
+    The deepest path containing every path, like os.path.commonpath but folded over the
+    Path parts in one pass: no list of strings, and most paths pass on a single tuple compare.
+    """
+    it = iter(paths)
+    common = next(it).parts
+    for p in it:
+        parts = p.parts
+        if parts[:len(common)] == common:
+            continue
+        n = 0
+        for a, b in zip(common, parts):
+            if a != b:
+                break
+            n += 1
+        common = common[:n]
+        if not common:
+            break
+    return Path(*common)
+
+
+def compute_sha256(file_paths, base_path=None, drop_cache=False):
     """
     Computes a SHA-256 checksum for a list of files, incorporating both file contents and relative paths.
 
     :param file_paths: A list of Path objects representing files to include in the hash.
     :param base_path: Optional base path to compute relative paths from. Defaults to the common parent.
+    :param drop_cache: Release each file from the OS page cache after hashing it (e.g. a USB drive
+        being verified, whose files won't be read again).
     :return: SHA-256 hash string or None if an error occurs.
     """
     hasher = hashlib.sha256()
 
-    file_paths = [p for p in file_paths if p.is_file() and not is_excluded(p)]
+    # One stat per file both filters to regular files and stamps it for the memo
+    stamps = {}
+    for p in file_paths:
+        if is_excluded(p):
+            continue
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            stamps[p] = (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+    file_paths = list(stamps)
 
     logging.debug(f"Creating hash for {len(file_paths)} paths")
 
@@ -129,28 +314,87 @@ def compute_sha256(file_paths, base_path=None):
 
     # Establish base path for consistent relative path hashing
     if base_path is None:
-        base_path = Path(os.path.commonpath([str(p) for p in file_paths]))
-
-    for file_path in natsorted(file_paths, key=lambda p: str(p)):
-        if file_path.is_file() :
-            try:
-                # Include relative path in the hash
+        base_path = _common_parent(file_paths)
+
+    ordered = sorted(file_paths, key=_PATH_NATSORT_KEY)
+
+    base_str = str(Path(base_path))
+    memo_key = (base_str, tuple((str(p), stamps[p]) for p in ordered))
+    # A drive being verified (drop_cache) is always read: duplicate drives of one SKU mount at the
+    # same path with identical FAT stamps, so a remembered digest could vouch for the wrong drive.
+    digest = None if drop_cache else _HASH_MEMO.get(memo_key)
+    if digest is not None:
+        logging.debug(f"Files unchanged since last hash under {base_path}; reusing checksum")
+        return digest
+
+    # From an earlier run: one row per base path, holding a fingerprint of every file's stamp.
+    # ctime is in the stamp, so any write to a file (even one restoring its mtime) misses.
+    # Local masters only: a verified drive's path and stamps don't identify the physical drive.
+    fingerprint = hashlib.sha1(repr(memo_key[1]).encode("utf-8")).hexdigest()
+    cache_key = (base_str, 0, len(ordered))
+    cached = None
+    if not drop_cache:
+        try:
+            cached = get_cached("checksum", cache_key)
+        except OSError:
+            pass
+    if cached and cached[0] == fingerprint:
+        logging.debug(f"Files unchanged since a previous run under {base_path}; reusing checksum")
+        _remember_digest(memo_key, cached[1])
+        return cached[1]
+
+    # Relative paths are sliced off the path strings; relative_to() is only needed for the
+    # odd path that doesn't sit under base_path as a string prefix
+    base_prefix = os.path.join(base_str, "")
+
+    # The digest chains every file in order, so hashing itself stays serial; reader threads
+    # overlap the disk I/O for the next few files with hashing the current one.
+    for file_path in iter_prefetched(ordered):
+        # already filtered to regular files above; a file that vanishes since fails the hash
+        try:
+            # Include relative path in the hash
+            path_str = str(file_path)
+            if path_str.startswith(base_prefix):
+                rel_path = path_str[len(base_prefix):]
+                if os.sep != "/":
+                    rel_path = rel_path.replace(os.sep, "/")
+            else:
                 rel_path = file_path.relative_to(base_path).as_posix()
-                hasher.update(rel_path.encode('utf-8'))
-                logging.debug(f"Hashing path:[{base_path}] {rel_path}")
+            hasher.update(rel_path.encode('utf-8'))
+            logging.debug(f"Hashing path:[{base_path}] {rel_path}")
 
-                # Include file content in the hash
-                with file_path.open("rb") as f:
-                    while chunk := f.read(8192):
-                        hasher.update(chunk)
+            # Include file content in the hash
+            _update_hash_from_file(hasher, file_path, drop_cache)
 
-            except Exception as e:
-                logging.error(f"Error processing {file_path}: {e}")
-                return None
+        except Exception as e:
+            logging.error(f"Error processing {file_path}: {e}")
+            return None
 
-    return hasher.hexdigest()
+    digest = hasher.hexdigest()
+    if not drop_cache:
+        _remember_digest(memo_key, digest)
+        try:
+            put_cached("checksum", cache_key, [fingerprint, digest])
+        except OSError as e:
+            logging.debug(f"Could not cache checksum for {base_path}: {e}")
+    return digest
 
 
+def _remember_digest(memo_key, digest):
+    with _HASH_MEMO_LOCK:
+        if len(_HASH_MEMO) >= HASH_MEMO_SIZE:
+            _HASH_MEMO.pop(next(iter(_HASH_MEMO)))  # drop the oldest
+        _HASH_MEMO[memo_key] = digest
+
+
+
+# Names remove_system_files deletes, matched against each file or directory name
+SYSTEM_FILE_PATTERNS = [
+    '._*', '*.DS_Store', '.fseventsd', '.Trashes', '.TemporaryItems',
+    '.Spotlight-V100', '.DocumentRevisions-V100', 'System Volume Information', '*.tmp'
+]
+# All patterns folded into one compiled matcher, so each name is tested once
+_SYSTEM_NAME_RE = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in SYSTEM_FILE_PATTERNS))
 
 def remove_system_files(drive):
     """
@@ -159,28 +403,66 @@ def remove_system_files(drive):
     Args:
         drive (str or Path): The root directory of the drive.
     """
-    drive_path = Path(drive)  # Ensure it's a Path object
-
-    patterns_to_remove = [
-        '._*', '*.DS_Store', '.fseventsd', '.Trashes', '.TemporaryItems', 
-        '.Spotlight-V100', '.DocumentRevisions-V100', 'System Volume Information', '*.tmp'
-    ]
-
-    for pattern in patterns_to_remove:
-        for file in drive_path.rglob(pattern):  # Recursively find matching files/folders
+    # One os.scandir walk over the drive; DirEntry already knows each entry's type, so nothing is stat'ed
+    pending = [os.fspath(drive)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue  # unreadable directory: skip it, as the walk always has
+
+        for entry in entries:
+            if not _SYSTEM_NAME_RE.match(entry.name):
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                continue
+
+            # Matched directories are removed whole, never descended into
             try:
-                if file.is_file() or file.is_symlink():
-                    file.unlink()  # Remove file or symlink
-                    logging.warning(f"Removed file: {file}")
-                elif file.is_dir():
-                    shutil.rmtree(file)  # Recursively remove directory
-                    logging.warning(f"Removed directory: {file}")
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)  # Recursively remove directory
+                    logging.warning(f"Removed directory: {entry.path}")
+                else:
+                    os.unlink(entry.path)  # Remove file or symlink
+                    logging.warning(f"Removed file: {entry.path}")
             except Exception as e:
-                logging.error(f"Failed to remove {file}: {e}")
+                logging.error(f"Failed to remove {entry.path}: {e}")
                 return False
 
     return True
 
+# Folders remove_folder has moved aside for deletion; leftovers of an interrupted delete are swept
+_TRASH_NAME = re.compile(r"\.trash-[0-9a-f]{32}")
+_TRASH_ACTIVE = set()  # trash folders this process is still deleting
+_TRASH_LOCK = threading.Lock()
+
+def _delete_in_background(trash_path):
+    with _TRASH_LOCK:
+        if trash_path in _TRASH_ACTIVE:
+            return
+        _TRASH_ACTIVE.add(trash_path)
+
+    def run():
+        try:
+            shutil.rmtree(trash_path, ignore_errors=True)
+        finally:
+            with _TRASH_LOCK:
+                _TRASH_ACTIVE.discard(trash_path)
+
+    threading.Thread(target=run, name="RemoveFolder", daemon=True).start()
+
+def _sweep_trash(parent):
+    """Deletes .trash-* folders left in parent by a run that exited before finishing the delete."""
+    try:
+        with os.scandir(parent) as it:
+            stale = [Path(e.path) for e in it
+                     if _TRASH_NAME.fullmatch(e.name) and e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    for trash_path in stale:
+        _delete_in_background(trash_path)
+
 def remove_folder(folder_path, settings, logger=None):
     """
     Safely removes a folder and its contents, ensuring it is within an allowed base directory.
@@ -202,11 +484,21 @@ def remove_folder(folder_path, settings, logger=None):
     if str(folder_path) in ["/", "/home", "/Users", "/root", "/var", "/tmp"]:
         raise ValueError(f"Refusing to delete {folder_path} - critical system path detected!")
 
+    _sweep_trash(folder_path.parent)
+
     # Log and delete only if the folder exists
     if folder_path.exists():
         if logger:
             logger.warning(f"Deleting folder: {folder_path}")
-        shutil.rmtree(folder_path)
+        # Move the old tree aside (a same-filesystem rename) and delete it in the background,
+        # so the caller gets its fresh folder immediately
+        trash_path = folder_path.with_name(f".trash-{uuid.uuid4().hex}")
+        try:
+            os.replace(folder_path, trash_path)
+        except OSError:
+            shutil.rmtree(folder_path)
+        else:
+            _delete_in_background(trash_path)
         if logger:
             logger.info(f"Successfully deleted: {folder_path}")
 
@@ -237,15 +529,17 @@ def find_input_folder_from_isbn(self, input_path, isbn):
     logging.info(f"Looking for folder with {isbn} in name under {input_path}")
 
     # Check if input_path itself contains the ISBN
-    if input_path.is_dir() and isbn in input_path.name:
+    if isbn in input_path.name and input_path.is_dir():
         logging.info(f'{input_path} already contains ISBN {isbn}')
         return str(input_path)
 
-    # Search within subdirectories
-    for subpath in input_path.iterdir():
-        if subpath.is_dir() and isbn in subpath.name:
-            logging.info(f'Found folder based on ISBN: {subpath}')
-            return str(subpath)
+    # Search within subdirectories; scandir's dirent type answers is_dir() without a stat per entry,
+    # and the name test runs first so non-matching entries cost nothing more
+    with os.scandir(input_path) as entries:
+        for entry in entries:
+            if isbn in entry.name and entry.is_dir():
+                logging.info(f'Found folder based on ISBN: {entry.path}')
+                return entry.path
 
     # Raise an error if no folder is found
     raise ValueError(f"Folder with ISBN {isbn} not found under {input_path}.")
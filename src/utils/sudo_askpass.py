@@ -1,6 +1,13 @@
 import os, tempfile, stat, textwrap
 
+# The script never changes, so one copy per process serves every sudo call
+_askpass_path = None
+
 def make_askpass_script():
+    global _askpass_path
+    if _askpass_path and os.access(_askpass_path, os.X_OK):
+        return _askpass_path
+
     script = textwrap.dedent("""\
         #!/bin/bash
         /usr/bin/osascript -e '
@@ -10,8 +17,10 @@ def make_askpass_script():
             end tell
         ' -e 'text returned of result'
     """)
+    # mkstemp's private 0600 file, not a fixed shared name another user could plant a script at
     fd, path = tempfile.mkstemp(prefix="askpass_", text=True)
+    os.fchmod(fd, stat.S_IRWXU)  # set on the open descriptor: no separate stat + chmod by path
     with os.fdopen(fd, "w") as f:
         f.write(script)
-    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-    return path
\ No newline at end of file
+    _askpass_path = path
+    return path
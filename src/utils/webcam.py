@@ -1,9 +1,40 @@
 import cv2
+import queue
 from threading import Thread
 from PIL import Image, ImageTk
 from pyzbar.pyzbar import decode
 import numpy as np
-import time
+
+# Frames are decoded as grayscale at most this wide; plenty for an EAN-13 held up to the camera
+DECODE_MAX_WIDTH = 640
+# Capture format requested from the camera: small MJPG frames instead of the driver's default
+# (often 1080p YUYV), which is all a 320x240 preview and a barcode decode need
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
+CAPTURE_FPS = 30
+# A frame whose 8x8 average hash matches the last decoded one is skipped, but never more than
+# this many in a row: focus or lighting can change without changing the hash
+MAX_SKIPPED_FRAMES = 10
+# Margin kept around the last barcode found, as a fraction of its size, when decoding just that region
+ROI_PADDING = 0.5
+
+
+def _roi_around(points, offset, shape, pad=ROI_PADDING):
+    """(x0, y0, x1, y1) bounding points (at offset in the image) grown by pad, clipped to shape."""
+    left, top = points.min(axis=0) + offset
+    right, bottom = points.max(axis=0) + offset
+    dx, dy = (right - left) * pad, (bottom - top) * pad
+    return (max(0, int(left - dx)), max(0, int(top - dy)),
+            min(shape[1], int(right + dx) + 1), min(shape[0], int(bottom + dy) + 1))
+
+
+def _make_barcode_detector():
+    """OpenCV's built-in EAN/UPC detector (OpenCV >= 4.8), or None to fall back to pyzbar."""
+    try:
+        return cv2.barcode.BarcodeDetector()
+    except AttributeError:
+        return None
+
 
 class Webcam:
     def __init__(self, video_label, callback):
@@ -12,7 +43,15 @@ class Webcam:
         self.cap = None
         self.running = False
         self.thread = None
+        self.decode_thread = None
+        self._decode_q = queue.Queue(maxsize=1)  # only the newest frame waits to be decoded
+        self._polygons = []  # outlines of the barcodes found in the last decoded frame
+        self._roi = None  # region of the decode image around the last barcode found
+        self._last_hash = None  # average hash of the last decoded frame
+        self._skipped = 0
+        self._detector = _make_barcode_detector()
         self.img_tk = None  # Store the current image to avoid Tkinter resizing issues
+        self._preview = None  # PhotoImage the live frames are pasted into, made on the first frame
         self.last_detected_isbn = None # dont fire on repeateded detections of same ISBN
 
         # Set a fixed size for the video label
@@ -34,7 +73,21 @@ class Webcam:
                 self.cap.release()
                 self.cap = None
                 return
+            # Requests only: a camera that can't do them keeps its own format, and the
+            # preview/decode code scales whatever frames arrive
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
+            self.cap.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # newest frame, not a queue of stale ones
             self.running = True
+            self._decode_q = queue.Queue(maxsize=1)  # no frame left over from a previous run
+            self._polygons = []
+            self._roi = None
+            self._last_hash = None
+            self._preview = None  # stop() put the generic image back on the label
+            self.decode_thread = Thread(target=self._decode_frames, daemon=True)
+            self.decode_thread.start()
             self.thread = Thread(target=self._update_frame, daemon=True)
             self.thread.start()
 
@@ -42,56 +95,136 @@ class Webcam:
         if self.running:
 
             self.running = False
+            # The threads check running at the top of each loop; once joined, the capture thread
+            # has returned from its last read, so the handle can be released straight away
+            if self.thread:
+                self.thread.join(timeout=2)  # Added timeout to prevent hanging
+            if self.decode_thread:
+                self.decode_thread.join(timeout=2)
+            self.release()
+
+            # after the joins, so a last in-flight frame can't land on top of the generic image
             self.img_tk = self.generic_img
             self.video_label.config(image=self.img_tk)
             self.video_label.image = self.img_tk
-            if self.thread:
-                self.thread.join(timeout=2)  # Added timeout to prevent hanging
-            if self.cap:
-                time.sleep(0.5)  # Added delay to ensure resources are released properly
-                self.cap.release()
 
-                self.cap = None
-             
     def _update_frame(self):
         while self.running:
             ret, frame = self.cap.read()
             if not ret:
                 continue
 
-            # Barcode detection using pyzbar
-            barcodes = decode(frame)
+            # Hand the frame to the decode thread; if it's still busy with the last one, this
+            # frame just isn't decoded, and the preview carries on without waiting for pyzbar
+            try:
+                self._decode_q.put_nowait(frame)
+            except queue.Full:
+                pass
+
+            # Scale the frame to fit the fixed label size while maintaining the aspect ratio;
+            # OpenCV's area resize first, so the colour conversion and drawing run on the small image
+            height, width = frame.shape[:2]
+            scale = min(self.fixed_width / width, self.fixed_height / height, 1.0)
+            if scale < 1.0:
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+            # Convert frame to RGB for Tkinter; a new array, so drawing on it leaves the queued frame alone
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+            # Draw outlines around detected barcodes (in full-frame coordinates), all in one call
+            outlines = self._polygons
+            if outlines:
+                outlines = [(points * scale).astype(np.int32).reshape((-1, 1, 2)) for points in outlines]
+                cv2.polylines(frame, outlines, True, (0, 255, 0), 2)
+
+            img = Image.fromarray(frame)
+
+            # Paste into the same PhotoImage each frame rather than creating a new Tk image;
+            # a new one is only needed at start or if the camera's frame size changes
+            if self._preview is None or (self._preview.width(), self._preview.height()) != img.size:
+                self._preview = ImageTk.PhotoImage(image=img)
+                self.img_tk = self._preview
+                self.video_label.config(image=self.img_tk)
+                self.video_label.image = self.img_tk
+            else:
+                self._preview.paste(img)
+
+    def _decode_frames(self):
+        """Decode thread: scans the newest captured frame for barcodes."""
+        while self.running:
+            try:
+                frame = self._decode_q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            # Barcode detection on a downscaled grayscale copy
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            height, width = gray.shape
+            scale = 1.0
+            if width > DECODE_MAX_WIDTH:
+                scale = width / DECODE_MAX_WIDTH
+                gray = cv2.resize(gray, (DECODE_MAX_WIDTH, round(height / scale)), interpolation=cv2.INTER_AREA)
+
+            # Average hash: which of 8x8 block means are above the overall mean. A book held still
+            # gives the same 64 bits frame after frame, and decoding it again finds nothing new
+            # (the outlines from the last decode stay up)
+            small = cv2.resize(gray, (8, 8), interpolation=cv2.INTER_AREA)
+            frame_hash = (small > small.mean()).tobytes()
+            if frame_hash == self._last_hash and self._skipped < MAX_SKIPPED_FRAMES:
+                self._skipped += 1
+                continue
+            self._last_hash = frame_hash
+            self._skipped = 0
+
+            # A barcode held up to the camera moves little between frames: try the area around the
+            # last one first, a fraction of the pixels, and scan the whole frame only if it's gone
+            barcodes, offset = [], (0, 0)
+            if self._roi is not None:
+                x0, y0, x1, y1 = self._roi
+                barcodes, offset = self._find_barcodes(gray[y0:y1, x0:x1]), (x0, y0)
+            if not barcodes:
+                barcodes, offset = self._find_barcodes(gray), (0, 0)
+            self._roi = _roi_around(barcodes[0][1], offset, gray.shape) if barcodes else None
+
+            # outlines back in full-frame coordinates, for the preview to draw. The hull of a
+            # many-point outline is taken here, once per decode, not on every preview frame
+            outlines = []
+            for _, points in barcodes:
+                points = (points + offset) * scale
+                if len(points) > 4:
+                    points = cv2.convexHull(points.astype(np.float32)).reshape((-1, 2))
+                outlines.append(points)
+            self._polygons = outlines
+
             if barcodes:
-                barcode_data = barcodes[0].data.decode('utf-8')
+                barcode_data = barcodes[0][0]
                 if len(barcode_data) == 13 and barcode_data.isdigit() and (self.last_detected_isbn != barcode_data):
                     self.last_detected_isbn = barcode_data
                     self.callback(barcode_data)
                 #self.stop()  # Stop after detecting first barcode (optional)
 
-            # Draw rectangles around detected barcodes
-            for barcode in barcodes:
-                points = barcode.polygon
-                if len(points) > 4:
-                    hull = cv2.convexHull(np.array(points, dtype=np.float32))
-                    points = hull
-                points = np.array(points, dtype=np.int32).reshape((-1, 1, 2))
-                for j in range(len(points)):
-                    cv2.line(frame, tuple(points[j][0]), tuple(points[(j+1) % len(points)][0]), (0, 255, 0), 3)
-
-            # Convert frame to ImageTk for Tkinter
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame)
-
-            # Scale the image to fit the fixed label size while maintaining the aspect ratio
-            img.thumbnail((self.fixed_width, self.fixed_height), Image.LANCZOS)
-
-            self.img_tk = ImageTk.PhotoImage(image=img)
-            self.video_label.config(image=self.img_tk)
-            self.video_label.image = self.img_tk
+    def _find_barcodes(self, gray):
+        """
+        [(data, points)] for the barcodes decoded in a grayscale image; points is a float32
+        (N, 2) array outlining each one. Uses OpenCV's detector, which takes the array as-is and
+        returns its corners as an array, or pyzbar where OpenCV lacks it.
+        """
+        if self._detector is not None:
+            ok, infos, _types, corners = self._detector.detectAndDecodeWithType(gray)
+            if not ok or corners is None:
+                return []
+            # detected but undecodable barcodes come back with empty data
+            return [(info, pts.astype(np.float32)) for info, pts in zip(infos, corners) if info]
+        return [(barcode.data.decode('utf-8'), np.array(barcode.polygon, dtype=np.float32))
+                for barcode in decode(gray)]
 
     def release(self):
         if self.cap:
-            self.cap.release()
+            try:
+                self.cap.release()
+            except cv2.error:
+                pass  # already closed by the backend
             self.cap = None
 
     def __del__(self):
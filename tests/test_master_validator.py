@@ -0,0 +1,72 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from natsort import natsort_keygen
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("BOOKMASTER_SHEET_ID", "test")  # utils imports the registry module, which reads it
+
+from utils import compute_sha256
+from utils.master_validator import MasterValidator
+
+# natural order puts 2.mp3 before 10.mp3; plain sorting would not
+DRIVE_FILES = {
+    "id.txt": b"9780000000002",
+    "tracks/2.mp3": b"\x00\x01" * 40_000,  # large enough to be hashed from an mmap
+    "tracks/10.mp3": b"ID3 short track",
+    "bookInfo/count.txt": b"2",
+    "bookInfo/empty.txt": b"",
+}
+EXCLUDED = {
+    "bookInfo/checksum.txt": b"0" * 64,
+    ".DS_Store": b"junk",
+}
+
+
+@pytest.fixture
+def drive(tmp_path):
+    for rel, data in {**DRIVE_FILES, **EXCLUDED}.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return tmp_path
+
+
+def reference_digest(h):
+    """Feeds h the stream every backend hashes: relative path, then bytes, in natural path order."""
+    for rel in sorted(DRIVE_FILES, key=natsort_keygen()):
+        h.update(rel.encode("utf-8"))
+        h.update(DRIVE_FILES[rel])
+    return h.hexdigest()
+
+
+def validator(root):
+    return MasterValidator(SimpleNamespace(mountpoint=str(root)))
+
+
+def test_sha256_matches_compute_sha256(drive):
+    expected = reference_digest(hashlib.sha256())
+    files = [p for p in drive.rglob("*") if p.is_file()]
+    assert compute_sha256(files, base_path=drive) == expected
+    assert validator(drive)._compute_dir_hash(drive, "sha256") == expected
+
+
+def test_blake3_hashes_the_same_stream(drive):
+    blake3 = pytest.importorskip("blake3")
+    expected = reference_digest(blake3.blake3())
+    assert validator(drive)._compute_dir_hash(drive, "blake3") == expected
+
+
+def test_crc32c_hashes_the_same_stream(drive):
+    google_crc32c = pytest.importorskip("google_crc32c")
+    expected = reference_digest(google_crc32c.Checksum()).decode("ascii")
+    assert validator(drive)._compute_dir_hash(drive, "crc32c") == expected
+
+
+def test_unknown_algorithm_is_rejected(drive):
+    with pytest.raises(ValueError):
+        validator(drive)._compute_dir_hash(drive, "md5")